@@ -0,0 +1,108 @@
+"""
+ActuatorState class is responsible for tracking last requested state of robotic car actuators,
+so redundant steering commands are not sent to the car.
+"""
+
+import threading
+
+
+class ActuatorState:
+    """
+    Class is representing last requested speed of motors and turn parameter of servo.
+    Update methods return information if the new value differs from the current one,
+    so request has to be sent, and count sent and skipped commands.
+    Unknown state (e.g. before first command or after failed request) is stored as None.
+    """
+
+    def __init__(self):
+        self._speed = None
+        self._turn = None
+
+        self._sent_commands_amount = 0
+        self._skipped_commands_amount = 0
+        self._lock = threading.Lock()
+
+
+    def update_speed(self, speed: int) -> bool:
+        """
+        Set requested speed. Returns True if it differs from current speed.
+        """
+        with self._lock:
+            is_changed = self._speed != speed
+            self._speed = speed
+            self._count_skipped(is_changed)
+
+        return is_changed
+
+
+    def update_turn(self, turn: int) -> bool:
+        """
+        Set requested turn parameter. Returns True if it differs from current turn parameter.
+        """
+        with self._lock:
+            is_changed = self._turn != turn
+            self._turn = turn
+            self._count_skipped(is_changed)
+
+        return is_changed
+
+
+    def invalidate_speed(self):
+        """Mark speed as unknown, so next speed command is always sent."""
+        with self._lock:
+            self._speed = None
+
+
+    def invalidate_turn(self):
+        """Mark turn parameter as unknown, so next turn command is always sent."""
+        with self._lock:
+            self._turn = None
+
+
+    def register_sent_command(self):
+        """Increase amount of commands sent to robotic car."""
+        with self._lock:
+            self._sent_commands_amount += 1
+
+
+    def _count_skipped(self, is_changed: bool):
+        if not is_changed:
+            self._skipped_commands_amount += 1
+
+
+    def get_speed(self) -> int:
+        """Requested speed getter."""
+        return self._speed
+
+
+    def get_turn(self) -> int:
+        """Requested turn parameter getter."""
+        return self._turn
+
+
+    def get_sent_commands_amount(self) -> int:
+        """Amount of sent commands getter."""
+        return self._sent_commands_amount
+
+
+    def get_skipped_commands_amount(self) -> int:
+        """Amount of skipped redundant commands getter."""
+        return self._skipped_commands_amount
+
+
+    def print_statistics(self):
+        """
+        Print commands statistics on console.
+        """
+        print("Steering commands stats:")
+        print(f"    Sent: {self._sent_commands_amount}")
+        print(f"    Skipped as redundant: {self._skipped_commands_amount}")
+
+
+if __name__ == "__main__":
+    state = ActuatorState()
+    for speed in (90, 90, 90, 0):
+        if state.update_speed(speed):
+            state.register_sent_command()
+    print(f"Speed: {state.get_speed()}")
+    state.print_statistics()
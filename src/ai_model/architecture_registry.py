@@ -0,0 +1,98 @@
+"""
+ArchitectureRegistry class is responsible for creating neural network models by name
+of their architecture.
+"""
+
+import torch.nn as nn
+
+from ai_model.neural_network_model import NeuralNetworkModel
+from ai_model.fast_architectures import GlobalPoolModel, DepthwiseSeparableModel
+
+
+class ArchitectureRegistry:
+    """
+    Class is registry of architectures which can be trained and used for steering robotic car.
+    Each architecture is model class, size of input images and default width parameters of the
+    model, which can be scaled by width multiplier:
+        baseline - NeuralNetworkModel at 128x128,
+        low-resolution - NeuralNetworkModel at 64x64,
+        global-pool - convolutional blocks of NeuralNetworkModel with global pooling head,
+        depthwise-separable - MobileNet-like depthwise separable convolutions.
+    """
+
+    _ARCHITECTURES = {
+        "baseline": (NeuralNetworkModel, (128, 128),
+                     {"widths": (64, 128, 256), "hidden_units": 1024}),
+        "low-resolution": (NeuralNetworkModel, (64, 64),
+                           {"widths": (64, 128, 256), "hidden_units": 1024}),
+        "global-pool": (GlobalPoolModel, (128, 128), {"widths": (64, 128, 256)}),
+        "depthwise-separable": (DepthwiseSeparableModel, (128, 128),
+                                {"widths": (32, 64, 128, 256)}),
+    }
+
+    DEFAULT_ARCHITECTURE = "baseline"
+
+    @staticmethod
+    def get_names() -> list:
+        """Names of registered architectures getter."""
+        return list(ArchitectureRegistry._ARCHITECTURES.keys())
+
+
+    @staticmethod
+    def get_input_size(name: str) -> tuple:
+        """Size of input images of the architecture getter."""
+        return ArchitectureRegistry._ARCHITECTURES[name][1]
+
+
+    @staticmethod
+    def create_parameters(name: str, classes_amount: int, width_multiplier: float = 1.0) -> dict:
+        """
+        Parameters of the model's constructor with default widths scaled by width multiplier.
+        """
+        parameters = {"classes_amount": classes_amount}
+        for parameter_name, value in ArchitectureRegistry._ARCHITECTURES[name][2].items():
+            if isinstance(value, tuple):
+                parameters[parameter_name] = tuple(max(1, round(width_multiplier * width))
+                                                   for width in value)
+            else:
+                parameters[parameter_name] = max(1, round(width_multiplier * value))
+
+        return parameters
+
+
+    @staticmethod
+    def create_model(name: str, parameters: dict) -> nn.Module:
+        """
+        Create model of given architecture. Parameters are passed to the model's constructor
+        (e.g. classes_amount).
+        """
+        model_class = ArchitectureRegistry._ARCHITECTURES[name][0]
+        return model_class(**parameters)
+
+
+    @staticmethod
+    def create_checkpoint(name: str, parameters: dict, model: nn.Module,
+                          input_size: tuple, classes: list) -> dict:
+        """
+        Create checkpoint of the model, from which it can be rebuilt without pickling its class.
+        Classes are labels of model outputs.
+        """
+        return {
+            "architecture": name,
+            "parameters": parameters,
+            "input_size": tuple(input_size),
+            "classes": list(classes),
+            "state_dict": model.state_dict(),
+        }
+
+
+    @staticmethod
+    def create_model_from_checkpoint(checkpoint: dict) -> nn.Module:
+        """
+        Rebuild model saved in checkpoint created by create_checkpoint.
+        """
+        model = ArchitectureRegistry.create_model(checkpoint["architecture"],
+                                                  checkpoint["parameters"])
+        model.load_state_dict(checkpoint["state_dict"])
+
+        return model
@@ -0,0 +1,99 @@
+"""
+BatchAugmenter class is responsible for random augmentation and normalization of whole batches
+of uint8 images during training.
+"""
+
+import math
+import torch
+import torch.nn.functional as F
+
+
+class BatchAugmenter:
+    """
+    Class augments batch of uint8 images of shape (N, 3, height, width) with vectorized
+    operations on the training device: random brightness and contrast jitter, small rotation
+    and shift (single affine grid sample per batch) and horizontal flip. Flipped image shows
+    the track turning the other way, so labels of flipped images are swapped: left with right
+    and slight-left with slight-right. Augmented images are normalized.
+    """
+
+    _MIRRORED_LABELS = {
+        "left": "right",
+        "right": "left",
+        "slight-left": "slight-right",
+        "slight-right": "slight-left",
+    }
+
+    def __init__(self, classes: list, is_enabled: bool = True, brightness: float = 0.2,
+                 contrast: float = 0.2, max_rotation_deg: float = 5.0, max_shift: float = 0.05,
+                 flip_probability: float = 0.5, mean: tuple = (0.485, 0.456, 0.406),
+                 std: tuple = (0.229, 0.224, 0.225)):
+        self._is_enabled = is_enabled
+        self._brightness = brightness
+        self._contrast = contrast
+        self._max_rotation_rad = math.radians(max_rotation_deg)
+        self._max_shift = max_shift
+        self._flip_probability = flip_probability
+
+        class_to_idx = {name: label for label, name in enumerate(classes)}
+        self._mirrored_labels = torch.tensor([
+            class_to_idx.get(self._MIRRORED_LABELS.get(name), label)
+            for label, name in enumerate(classes)
+        ])
+        self._mean = torch.tensor(mean, dtype=torch.float32).view(1, 3, 1, 1)
+        self._std = torch.tensor(std, dtype=torch.float32).view(1, 3, 1, 1)
+
+
+    def augment(self, images: torch.Tensor, labels: torch.Tensor) -> (torch.Tensor, torch.Tensor):
+        """
+        Return randomly augmented and normalized float images of uint8 batch and their labels.
+        If augmentation is disabled, images are only normalized.
+        """
+        images = images.float().div_(255.0)
+        if self._is_enabled:
+            is_flipped = torch.rand(images.shape[0], device=images.device) < self._flip_probability
+            images = self._transform_geometry(images, is_flipped)
+            images = self._jitter_colors(images)
+            labels = torch.where(is_flipped, self._mirrored_labels.to(labels.device)[labels],
+                                 labels)
+
+        return (self._normalize(images), labels)
+
+
+    def _transform_geometry(self, images: torch.Tensor, is_flipped: torch.Tensor) -> torch.Tensor:
+        """
+        Rotate, shift and flip images with single affine transformation.
+        """
+        batch_size = images.shape[0]
+        device = images.device
+        angles = (torch.rand(batch_size, device=device) * 2 - 1) * self._max_rotation_rad
+        # Shift is given as fraction of image size, while grid coordinates span from -1 to 1.
+        shifts = (torch.rand(batch_size, 2, device=device) * 2 - 1) * 2 * self._max_shift
+        x_scales = torch.where(is_flipped, -1.0, 1.0)
+        cos, sin = torch.cos(angles), torch.sin(angles)
+
+        theta = torch.stack([
+            torch.stack([cos * x_scales, -sin, shifts[:, 0]], dim=1),
+            torch.stack([sin * x_scales, cos, shifts[:, 1]], dim=1),
+        ], dim=1)
+        grid = F.affine_grid(theta, images.shape, align_corners=False)
+
+        return F.grid_sample(images, grid, mode="bilinear", padding_mode="border",
+                             align_corners=False)
+
+
+    def _jitter_colors(self, images: torch.Tensor) -> torch.Tensor:
+        batch_size = images.shape[0]
+        device = images.device
+        brightness = 1 + (torch.rand(batch_size, 1, 1, 1, device=device) * 2 - 1) * self._brightness
+        contrast = 1 + (torch.rand(batch_size, 1, 1, 1, device=device) * 2 - 1) * self._contrast
+
+        images = images * brightness
+        mean = images.mean(dim=(1, 2, 3), keepdim=True)
+        images = (images - mean) * contrast + mean
+
+        return images.clamp_(0.0, 1.0)
+
+
+    def _normalize(self, images: torch.Tensor) -> torch.Tensor:
+        return (images - self._mean.to(images.device)) / self._std.to(images.device)
@@ -0,0 +1,93 @@
+"""
+ChannelPruner class is responsible for structured pruning of trained model: removing whole
+channels of convolutional layers and units of hidden fully connected layers.
+"""
+
+import copy
+import torch
+import torch.nn as nn
+
+
+class ChannelPruner:
+    """
+    Class prunes given ratio of output channels of every convolutional layer and of units
+    of every hidden linear layer. Channels and units with the smallest L1 norm of weights are
+    removed and the rest of weights is copied into smaller model of the same class.
+    Supported are models built of plain convolutions and linear layers, which accept widths
+    (and hidden_units) in constructor: NeuralNetworkModel and GlobalPoolModel.
+    """
+
+    def __init__(self, ratio: float):
+        self._ratio = ratio
+
+
+    def prune(self, model: nn.Module, parameters: dict) -> (nn.Module, dict):
+        """
+        Return pruned copy of the model and parameters of its constructor.
+        """
+        model = copy.deepcopy(model).cpu().eval()
+        convolutions = [module for module in model.modules() if isinstance(module, nn.Conv2d)]
+        linears = [module for module in model.modules() if isinstance(module, nn.Linear)]
+        self._validate_model(model, convolutions)
+
+        kept_indices = torch.arange(3)
+        weights = []
+        for convolution in convolutions:
+            output_indices = self._select_kept_indices(convolution.weight)
+            weights.append(self._prune_layer(convolution, kept_indices, output_indices))
+            kept_indices = output_indices
+
+        # Input of first linear layer is flattened pooled feature map: each channel of last
+        # convolution corresponds to block of spatial_size consecutive inputs.
+        spatial_size = linears[0].in_features // convolutions[-1].out_channels
+        kept_indices = (kept_indices[:, None] * spatial_size + torch.arange(spatial_size)).flatten()
+        hidden_units = []
+        for linear in linears[:-1]:
+            output_indices = self._select_kept_indices(linear.weight)
+            weights.append(self._prune_layer(linear, kept_indices, output_indices))
+            hidden_units.append(len(output_indices))
+            kept_indices = output_indices
+        weights.append(self._prune_layer(linears[-1], kept_indices,
+                                         torch.arange(linears[-1].out_features)))
+
+        pruned_parameters = dict(parameters)
+        pruned_parameters["widths"] = tuple(weight.shape[0] for weight, _ in
+                                            weights[:len(convolutions)])
+        if hidden_units:
+            pruned_parameters["hidden_units"] = hidden_units[0]
+        pruned_model = type(model)(**pruned_parameters)
+        self._copy_weights(pruned_model, weights)
+
+        return (pruned_model.eval(), pruned_parameters)
+
+
+    def _validate_model(self, model: nn.Module, convolutions: list):
+        is_supported = all(convolution.groups == 1 for convolution in convolutions) and not any(
+            isinstance(module, nn.BatchNorm2d) for module in model.modules())
+        if not is_supported:
+            raise ValueError(f"Channel pruning of {type(model).__name__} is not supported")
+
+
+    def _select_kept_indices(self, weight: torch.Tensor) -> torch.Tensor:
+        norms = weight.detach().abs().flatten(1).sum(1)
+        kept_amount = max(1, round(len(norms) * (1 - self._ratio)))
+
+        return torch.topk(norms, kept_amount).indices.sort().values
+
+
+    def _prune_layer(self, layer: nn.Module, input_indices: torch.Tensor,
+                     output_indices: torch.Tensor) -> (torch.Tensor, torch.Tensor):
+        weight = layer.weight.detach()[output_indices][:, input_indices].clone()
+        bias = layer.bias.detach()[output_indices].clone() if layer.bias is not None else None
+
+        return (weight, bias)
+
+
+    def _copy_weights(self, model: nn.Module, weights: list):
+        layers = [module for module in model.modules() if isinstance(module, (nn.Conv2d,
+                                                                              nn.Linear))]
+        with torch.no_grad():
+            for layer, (weight, bias) in zip(layers, weights):
+                layer.weight.copy_(weight)
+                if bias is not None:
+                    layer.bias.copy_(bias)
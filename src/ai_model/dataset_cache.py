@@ -0,0 +1,182 @@
+"""
+DatasetCache class is responsible for one-time preprocessing of .jpg dataset into memory-mapped
+file of resized uint8 images. CachedImageDataset class reads images from such file without
+decoding them.
+"""
+
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import torch
+from torch.utils.data import Dataset
+
+
+class DatasetCache:
+    """
+    Class keeps dataset subsets (e.g. train, test) preprocessed in cache directory. Images are
+    decoded, converted to RGB and resized to model input size once, and stored as single raw
+    uint8 file of shape (N, 3, height, width) next to .json index with classes, labels and
+    fingerprint of the subset. Fingerprint is computed from paths, sizes and modification times
+    of images listed in dataset manifest, so cache is rebuilt when any file is added, removed
+    or changed.
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, cache_directory: str, input_size: tuple):
+        self._cache_directory = cache_directory
+        self._input_size = input_size
+
+
+    def load(self, subset: str, classes: list, entries: list,
+             normalize: bool = True) -> "CachedImageDataset":
+        """
+        Return dataset of images of the subset, given as classes and manifest entries
+        (dictionaries with path, label, size and mtime_ns). Images of labels which aren't
+        in classes are skipped. Cache is built first, if it doesn't exist or is outdated.
+        Dataset returns normalized float images, or raw uint8 images if normalize is False.
+        """
+        class_to_idx = {name: label for label, name in enumerate(classes)}
+        entries = [entry for entry in entries if entry["label"] in class_to_idx]
+        samples = [(entry["path"], class_to_idx[entry["label"]]) for entry in entries]
+        fingerprint = self._compute_fingerprint(classes, entries)
+
+        images_path, index_path = self._get_cache_paths(subset)
+        if not self._is_cache_valid(index_path, images_path, fingerprint):
+            self._build_cache(samples, classes, fingerprint, images_path, index_path)
+
+        return CachedImageDataset(images_path, index_path, normalize)
+
+
+    def _get_cache_paths(self, subset: str) -> (str, str):
+        height, width = self._input_size
+        base_path = os.path.join(self._cache_directory, f"{subset}_{height}x{width}")
+
+        return (f"{base_path}.u8", f"{base_path}.json")
+
+
+    def _compute_fingerprint(self, classes: list, entries: list) -> str:
+        fingerprint = hashlib.sha256()
+        fingerprint.update(f"{self._FORMAT_VERSION} {self._input_size} {classes}\n"
+                           .encode("utf-8"))
+        for entry in entries:
+            fingerprint.update(f"{entry['path']} {entry['label']} {entry['size']} "
+                               f"{entry['mtime_ns']}\n".encode("utf-8"))
+
+        return fingerprint.hexdigest()
+
+
+    def _is_cache_valid(self, index_path: str, images_path: str, fingerprint: str) -> bool:
+        if not os.path.isfile(index_path) or not os.path.isfile(images_path):
+            return False
+        with open(file=index_path, mode="r", encoding="utf-8") as file:
+            index = json.load(file)
+
+        return index.get("fingerprint") == fingerprint
+
+
+    def _build_cache(self, samples: list, classes: list, fingerprint: str, images_path: str,
+                     index_path: str):
+        height, width = self._input_size
+        print(f"Preprocessing {len(samples)} images into {images_path}...")
+        os.makedirs(self._cache_directory, exist_ok=True)
+        # Cache is written into temporary files and replaced atomically, so processes building
+        # the same cache at once (e.g. parallel trainings) never read partially written file.
+        temporary_images_path = f"{images_path}.{os.getpid()}.tmp"
+        temporary_index_path = f"{index_path}.{os.getpid()}.tmp"
+        if os.path.exists(temporary_images_path):
+            os.remove(temporary_images_path)
+
+        image_size = 3 * height * width
+        images = torch.from_file(temporary_images_path, shared=True,
+                                 size=max(1, len(samples)) * image_size, dtype=torch.uint8)
+        images = images[:len(samples) * image_size].view(len(samples), 3, height, width)
+
+        def write_image(sample_index: int):
+            images[sample_index].copy_(self._read_image(samples[sample_index][0]))
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(write_image, range(len(samples))))
+        del images
+
+        index = {
+            "fingerprint": fingerprint,
+            "classes": classes,
+            "labels": [label for _, label in samples],
+            "shape": [len(samples), 3, height, width],
+        }
+        with open(file=temporary_index_path, mode="w", encoding="utf-8") as file:
+            json.dump(index, file)
+        os.replace(temporary_images_path, images_path)
+        os.replace(temporary_index_path, index_path)
+
+
+    def _read_image(self, path: str) -> torch.Tensor:
+        height, width = self._input_size
+        with Image.open(path) as image:
+            image = image.convert("RGB").resize((width, height), Image.BILINEAR)
+        pixels = torch.frombuffer(bytearray(image.tobytes()), dtype=torch.uint8)
+
+        return pixels.view(height, width, 3).permute(2, 0, 1)
+
+
+class CachedImageDataset(Dataset):
+    """
+    Class is dataset of images preprocessed by DatasetCache. Images are memory-mapped, so
+    they are read from disk only when used and shared by all data loader workers. Each image
+    is only converted into normalized float tensor, or returned as it is (uint8), so whole
+    batches can be augmented and normalized at once. Like ImageFolder, dataset has classes
+    and targets.
+    """
+
+    def __init__(self, images_path: str, index_path: str, normalize: bool = True,
+                 mean: tuple = (0.485, 0.456, 0.406), std: tuple = (0.229, 0.224, 0.225)):
+        with open(file=index_path, mode="r", encoding="utf-8") as file:
+            index = json.load(file)
+        self.classes = index["classes"]
+        self.class_to_idx = {name: label for label, name in enumerate(self.classes)}
+        self.targets = index["labels"]
+        self._shape = tuple(index["shape"])
+        self._images_path = images_path
+        self._images = None
+        self._normalize = normalize
+
+        mean = torch.tensor(mean, dtype=torch.float32).view(3, 1, 1)
+        std = torch.tensor(std, dtype=torch.float32).view(3, 1, 1)
+        self._scale = 1.0 / (255.0 * std)
+        self._bias = -mean / std
+
+
+    def __len__(self) -> int:
+        return self._shape[0]
+
+
+    def __getitem__(self, index: int) -> (torch.Tensor, int):
+        image = self.get_images()[index]
+        if self._normalize:
+            image = torch.mul(image, self._scale).add_(self._bias)
+
+        return (image, self.targets[index])
+
+
+    def get_images(self) -> torch.Tensor:
+        """
+        Memory-mapped uint8 images of shape (N, 3, height, width) getter. File is mapped
+        on first use in each process.
+        """
+        if self._images is None:
+            amount, channels, height, width = self._shape
+            size = amount * channels * height * width
+            images = torch.from_file(self._images_path, shared=False, size=max(1, size),
+                                     dtype=torch.uint8)
+            self._images = images[:size].view(self._shape)
+
+        return self._images
+
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_images"] = None
+        return state
@@ -0,0 +1,35 @@
+"""
+DistillationLoss class is responsible for computing loss of student model trained to imitate
+teacher model.
+"""
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class DistillationLoss(nn.Module):
+    """
+    Class is knowledge distillation loss: weighted sum of Kullback-Leibler divergence between
+    teacher's and student's outputs softened by temperature, and cross entropy with labels.
+    """
+    def __init__(self, temperature: float = 4.0, alpha: float = 0.7):
+        super(DistillationLoss, self).__init__()
+        self._temperature = temperature
+        self._alpha = alpha
+        self._cross_entropy = nn.CrossEntropyLoss()
+
+    def forward(self, student_outputs: torch.Tensor, teacher_outputs: torch.Tensor,
+                labels: torch.Tensor) -> torch.Tensor:
+        """
+        Loss of student outputs given teacher outputs and labels of the batch.
+        """
+        distillation_loss = F.kl_div(
+            F.log_softmax(student_outputs / self._temperature, dim=1),
+            F.log_softmax(teacher_outputs / self._temperature, dim=1),
+            reduction="batchmean",
+            log_target=True
+        ) * self._temperature ** 2
+        labels_loss = self._cross_entropy(student_outputs, labels)
+
+        return self._alpha * distillation_loss + (1 - self._alpha) * labels_loss
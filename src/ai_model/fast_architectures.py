@@ -0,0 +1,83 @@
+"""
+Lightweight architectures of neural network for steering robotic car, which are faster on CPU
+than NeuralNetworkModel.
+"""
+
+import torch
+import torch.nn as nn
+
+
+class GlobalPoolModel(nn.Module):
+    """
+    Class is representing NeuralNetworkModel's convolutional blocks with global average pooling
+    head. Large fully connected layer is replaced by single linear classifier.
+    """
+    def __init__(self, classes_amount, widths=(64, 128, 256)):
+        super(GlobalPoolModel, self).__init__()
+        layers = []
+        in_channels = 3
+        for out_channels in widths:
+            layers += [
+                nn.Conv2d(in_channels, out_channels, kernel_size=3, stride=1, padding=1),
+                nn.ReLU(inplace=True),
+                nn.MaxPool2d(kernel_size=2, stride=2)
+            ]
+            in_channels = out_channels
+        self.features = nn.Sequential(*layers)
+
+        self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
+        self.classifier = nn.Linear(in_channels, classes_amount)
+
+    def forward(self, x):
+        """
+        input object as a parameter to neural network in order to classify it
+        """
+        x = self.features(x)
+        x = self.avgpool(x)
+        x = torch.flatten(x, 1)
+        x = self.classifier(x)
+
+        return x
+
+
+class DepthwiseSeparableModel(nn.Module):
+    """
+    Class is representing MobileNet-like architecture: strided stem convolution followed by
+    depthwise separable blocks (3x3 depthwise and 1x1 pointwise convolution), each of them
+    halving resolution, and global average pooling head.
+    """
+    def __init__(self, classes_amount, widths=(32, 64, 128, 256)):
+        super(DepthwiseSeparableModel, self).__init__()
+        layers = [
+            nn.Conv2d(3, widths[0], kernel_size=3, stride=2, padding=1, bias=False),
+            nn.BatchNorm2d(widths[0]),
+            nn.ReLU(inplace=True)
+        ]
+        for in_channels, out_channels in zip(widths[:-1], widths[1:]):
+            layers += self._create_separable_block(in_channels, out_channels)
+        self.features = nn.Sequential(*layers)
+
+        self.avgpool = nn.AdaptiveAvgPool2d((1, 1))
+        self.classifier = nn.Linear(widths[-1], classes_amount)
+
+    def _create_separable_block(self, in_channels, out_channels):
+        return [
+            nn.Conv2d(in_channels, in_channels, kernel_size=3, stride=2, padding=1,
+                      groups=in_channels, bias=False),
+            nn.BatchNorm2d(in_channels),
+            nn.ReLU(inplace=True),
+            nn.Conv2d(in_channels, out_channels, kernel_size=1, bias=False),
+            nn.BatchNorm2d(out_channels),
+            nn.ReLU(inplace=True)
+        ]
+
+    def forward(self, x):
+        """
+        input object as a parameter to neural network in order to classify it
+        """
+        x = self.features(x)
+        x = self.avgpool(x)
+        x = torch.flatten(x, 1)
+        x = self.classifier(x)
+
+        return x
@@ -0,0 +1,126 @@
+"""
+FastPreprocessor class is responsible for fast conversion of .jpg images taken by robotic car
+into normalized tensors, which are input of neural network model.
+"""
+
+import sys
+import time
+import warnings
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
+import numpy
+import torch
+import torchvision.transforms as transforms
+
+from frame_reader import MemoryViewStream
+
+
+class FastPreprocessor:
+    """
+    Class converts .jpg image stored in bytes into normalized tensor. JPEG is decoded in draft
+    mode, which lets decoder scale image down already during decoding, directly to RGB and close
+    to the model input size. Conversion from uint8 pixels and normalization are fused into
+    multiply-add written into given (e.g. preallocated) float tensor. Input size is
+    (height, width), like in the rest of the model code.
+    """
+
+    def __init__(self, input_size: tuple = (128, 128),
+                 mean: tuple = (0.485, 0.456, 0.406), std: tuple = (0.229, 0.224, 0.225)):
+        self._input_size = input_size
+        mean = torch.tensor(mean, dtype=torch.float32).view(3, 1, 1)
+        std = torch.tensor(std, dtype=torch.float32).view(3, 1, 1)
+        self._scale = 1.0 / (255.0 * std)
+        self._bias = -mean / std
+
+
+    def preprocess(self, content: memoryview, output: torch.Tensor = None) -> torch.Tensor:
+        """
+        Convert .jpg image stored in bytes-like object into normalized tensor of shape
+        (3, height, width). If output tensor is given, result is written into it.
+        """
+        image = self.decode(content)
+        return self.transform(image, output)
+
+
+    def decode(self, content: memoryview) -> Image.Image:
+        """
+        Decode .jpg image into RGB image of model input size. Image is read directly from
+        given bytes-like object without copying it.
+        """
+        image = Image.open(MemoryViewStream(memoryview(content)))
+        height, width = self._input_size
+        image.draft("RGB", (width, height))
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if image.size != (width, height):
+            image = image.resize((width, height), Image.BILINEAR)
+
+        return image
+
+
+    def transform(self, image: Image.Image, output: torch.Tensor = None) -> torch.Tensor:
+        """
+        Convert RGB image into normalized float tensor. If output tensor is given, result is
+        written into it.
+        """
+        height, width = self._input_size
+        with warnings.catch_warnings():
+            # Pixels are only read, so tensor can share memory of read-only numpy array.
+            warnings.filterwarnings("ignore", message="The given NumPy array is not writable",
+                                    category=UserWarning)
+            pixels = torch.from_numpy(numpy.asarray(image)).permute(2, 0, 1)
+        if output is None:
+            output = torch.empty((3, height, width), dtype=torch.float32)
+        torch.mul(pixels, self._scale, out=output)
+        output.add_(self._bias)
+
+        return output
+
+
+    def create_output(self, batch_size: int = None) -> torch.Tensor:
+        """
+        Allocate float tensor for single image or batch of images of model input size.
+        """
+        height, width = self._input_size
+        if batch_size is None:
+            return torch.empty((3, height, width), dtype=torch.float32)
+
+        return torch.empty((batch_size, 3, height, width), dtype=torch.float32)
+
+
+    def get_input_size(self) -> tuple:
+        """Model input size getter."""
+        return self._input_size
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 fast_preprocessor.py path_to_image.jpg [iterations]")
+        sys.exit(1)
+
+    image_content = Path(sys.argv[1]).read_bytes()
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    reference_transform = transforms.Compose([
+        transforms.Resize((128, 128)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+    ])
+    preprocessor = FastPreprocessor()
+    preallocated_output = preprocessor.create_output()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        reference = reference_transform(Image.open(BytesIO(image_content)).convert('RGB'))
+    reference_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fast = preprocessor.preprocess(image_content, preallocated_output)
+    fast_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    print(f"Reference transform: {reference_ms:.3f} ms per image")
+    print(f"Fast preprocessor: {fast_ms:.3f} ms per image")
+    print(f"Speedup: {reference_ms / fast_ms:.2f}x")
+    print(f"Max absolute difference: {(reference - fast).abs().max().item():.4f}")
@@ -0,0 +1,241 @@
+"""
+HyperparameterSweep class is responsible for training many models with different
+hyperparameters at once and comparing them.
+"""
+
+import os
+import csv
+import json
+import random
+import itertools
+import contextlib
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import torch
+
+from ai_model.architecture_registry import ArchitectureRegistry
+from ai_model.dataset_cache import DatasetCache
+from ai_model.model_handler import ModelHandler
+from ai_model.model_statistics import ModelStatistics
+from dataset_manifest import DatasetManifest
+from settings_readers.sweep_settings_reader import SweepSettingsReader
+from date_to_str import DateToStr, DateNameType
+from commandline_args_parser import CommandLineArgsParser
+
+
+class HyperparameterSweep:
+    """
+    Class runs trials of grid or random search over hyperparameters listed in sweep settings.
+    Every trial is separate training of ModelHandler in process of process pool, so several
+    trials are trained at once on different CPU cores. Intra-op threads and data loader
+    workers of each trial are capped, so parallel trials don't oversubscribe CPU.
+    Parameters which aren't swept are taken from command line.
+    When all trials finish, single image latency of trained models is measured one by one
+    and leaderboard of test accuracy and latency is printed and saved in sweep directory,
+    together with logs of trials.
+    """
+
+    SWEPT_PARAMETERS = ("epochs", "batch", "architecture", "width", "lr", "optimizer")
+
+    def __init__(self, commandline_args_parser: CommandLineArgsParser):
+        self._base_parameters = {
+            "epochs": commandline_args_parser.get_epochs(),
+            "batch": commandline_args_parser.get_batch(),
+            "architecture": commandline_args_parser.get_architecture(),
+            "width": commandline_args_parser.get_width(),
+            "lr": commandline_args_parser.get_lr(),
+            "optimizer": commandline_args_parser.get_optimizer(),
+        }
+        self._patience = commandline_args_parser.get_patience()
+        self._import_from_sweep_settings()
+        self._set_workspace()
+
+        self._sweep_name = f"sweep_{DateToStr.parse_date(DateNameType.DATE_HOUR_MINUTE_SECONDS)}"
+        self._sweep_directory = os.path.abspath(f"trained_models/sweeps/{self._sweep_name}")
+
+
+    def _set_workspace(self):
+        current_workspace = str(Path(__file__).parent)
+        os.chdir(current_workspace)
+
+
+    def _import_from_sweep_settings(self):
+        sweep_settings_reader = SweepSettingsReader()
+        sweep_settings_reader.read()
+        self._search = sweep_settings_reader.get_search()
+        self._trials_amount = sweep_settings_reader.get_trials()
+        self._seed = sweep_settings_reader.get_seed()
+        self._parallel_trials = max(1, sweep_settings_reader.get_parallel_trials())
+        self._threads_per_trial = (sweep_settings_reader.get_threads_per_trial()
+                                   or max(1, os.cpu_count() // self._parallel_trials))
+        self._workers_per_trial = sweep_settings_reader.get_workers_per_trial()
+        self._swept_parameters = sweep_settings_reader.get_parameters()
+
+        for name in self._swept_parameters:
+            if name not in self.SWEPT_PARAMETERS:
+                raise ValueError(f"Unknown swept parameter: {name}. It has to be one of: "
+                                 f"{', '.join(self.SWEPT_PARAMETERS)}")
+
+
+    def run(self):
+        """
+        Train all trials of the sweep and save leaderboard.
+        """
+        trials = self._create_trials()
+        os.makedirs(self._sweep_directory, exist_ok=True)
+        self._prepare_datasets(trials)
+        print(f"Sweep {self._sweep_name}: {len(trials)} trials, {self._parallel_trials} at once, "
+              f"{self._threads_per_trial} threads and {self._workers_per_trial} data loader "
+              "workers each")
+
+        results = []
+        # Trials are started in fresh processes, as forking process which already runs
+        # torch thread pools may deadlock.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self._parallel_trials, mp_context=context) \
+                as executor:
+            futures = {}
+            for index, parameters in enumerate(trials):
+                trial_name = f"{self._sweep_name}_trial_{index}"
+                future = executor.submit(
+                    run_trial,
+                    self._create_trial_args(trial_name, parameters),
+                    self._threads_per_trial,
+                    self._workers_per_trial,
+                    os.path.join(self._sweep_directory, f"{trial_name}.log")
+                )
+                futures[future] = (trial_name, parameters)
+
+            for future in as_completed(futures):
+                trial_name, parameters = futures[future]
+                result = {"trial": trial_name, "parameters": parameters}
+                try:
+                    result.update(future.result())
+                    print(f"Trial {trial_name} finished with test accuracy "
+                          f"{result['test_accuracy']:.4f}")
+                except (Exception, SystemExit) as ex:
+                    result["error"] = repr(ex)
+                    print(f"Trial {trial_name} failed: {ex!r}. "
+                          f"See {trial_name}.log in {self._sweep_directory}")
+                results.append(result)
+
+        self._measure_latencies(results)
+        leaderboard = sorted(results, key=lambda result: (-result.get("test_accuracy", -1),
+                                                          result.get("latency_ms", 0)))
+        self._print_leaderboard(leaderboard)
+        self._save_leaderboard(leaderboard)
+
+
+    def _create_trials(self) -> list:
+        """
+        Parameters of every trial: every combination of swept values in grid search,
+        or given amount of distinct random combinations in random search.
+        """
+        names = list(self._swept_parameters)
+        combinations = [dict(zip(names, values)) for values in
+                        itertools.product(*(self._swept_parameters[name] for name in names))]
+        if self._search == "random":
+            combinations = random.Random(self._seed).sample(
+                combinations,
+                min(self._trials_amount, len(combinations))
+            )
+
+        return [{**self._base_parameters, **combination} for combination in combinations]
+
+
+    def _prepare_datasets(self, trials: list):
+        """
+        Synchronize dataset manifest and build dataset cache of every input size used by
+        trials once, before trials start, so trials only read them instead of racing to
+        refresh and build the same files.
+        """
+        path_to_datasets = "../../dataset/"
+        dataset_manifest = DatasetManifest(path_to_datasets)
+        dataset_manifest.refresh()
+        classes = dataset_manifest.get_classes("train")
+
+        input_sizes = {ArchitectureRegistry.get_input_size(parameters["architecture"].lower())
+                       for parameters in trials
+                       if parameters["architecture"].lower() in ArchitectureRegistry.get_names()}
+        for input_size in input_sizes:
+            dataset_cache = DatasetCache(f"{path_to_datasets}cache", input_size)
+            for subset in ("train", "test"):
+                dataset_cache.load(subset, classes, dataset_manifest.get_entries(subset))
+
+
+    def _create_trial_args(self, trial_name: str, parameters: dict) -> list:
+        args = ["--mode", "train", "--name", trial_name]
+        for name in self.SWEPT_PARAMETERS:
+            args.extend([f"--{name}", str(parameters[name])])
+        if self._patience:
+            args.extend(["--patience", str(self._patience)])
+
+        return args
+
+
+    def _measure_latencies(self, results: list):
+        """
+        Measure single image latency of trained models one by one, so measurements aren't
+        disturbed by other trials.
+        """
+        for result in results:
+            if "error" in result:
+                continue
+            model_path = os.path.join("trained_models", result["model"])
+            checkpoint = torch.load(model_path, map_location="cpu", weights_only=False)
+            model = ArchitectureRegistry.create_model_from_checkpoint(checkpoint).eval()
+            input_size = tuple(checkpoint["input_size"])
+            model_statistics = ModelStatistics(input_size)
+            result["latency_ms"] = 1000 * model_statistics.measure_latency(model)
+            result["size_mb"] = model_statistics.measure_size(model) / 2**20
+
+
+    def _print_leaderboard(self, leaderboard: list):
+        print("Sweep leaderboard:")
+        print(f"    {'#':>3} {'accuracy':>10} {'loss':>8} {'latency [ms]':>14} {'size [MB]':>10}"
+              "   parameters")
+        for place, result in enumerate(leaderboard, start=1):
+            parameters = ", ".join(f"{name}={value}" for name, value
+                                   in result["parameters"].items())
+            if "error" in result:
+                print(f"    {place:>3} {'failed':>10} {'':>8} {'':>14} {'':>10}   {parameters}")
+                continue
+            print(f"    {place:>3} {result['test_accuracy']:>10.4f} {result['test_loss']:>8.4f} "
+                  f"{result['latency_ms']:>14.2f} {result['size_mb']:>10.2f}   {parameters}")
+
+
+    def _save_leaderboard(self, leaderboard: list):
+        json_path = os.path.join(self._sweep_directory, "leaderboard.json")
+        with open(file=json_path, mode="w", encoding="utf-8") as file:
+            json.dump({"sweep": self._sweep_name, "search": self._search,
+                       "threads_per_trial": self._threads_per_trial,
+                       "trials": leaderboard}, file, indent=2)
+
+        csv_path = os.path.join(self._sweep_directory, "leaderboard.csv")
+        columns = ["trial", *self.SWEPT_PARAMETERS, "test_accuracy", "test_loss", "latency_ms",
+                   "size_mb", "epochs", "model", "error"]
+        with open(file=csv_path, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for result in leaderboard:
+                writer.writerow({**result, **result["parameters"]})
+
+        print(f"Leaderboard saved in {json_path}")
+
+
+def run_trial(args: list, threads_amount: int, workers_amount: int, log_path: str) -> dict:
+    """
+    Train single trial of the sweep in process of process pool with capped amount of threads.
+    Output of the training is written into log file. Returns result of the training.
+    """
+    torch.set_num_threads(threads_amount)
+    with open(file=log_path, mode="w", encoding="utf-8") as log_file, \
+            contextlib.redirect_stdout(log_file):
+        commandline_args_parser = CommandLineArgsParser(args)
+        commandline_args_parser.print_args()
+        model_handler = ModelHandler(commandline_args_parser, workers_amount,
+                                     refresh_dataset_manifest=False)
+        model_handler.train_model()
+
+        return model_handler.get_training_result()
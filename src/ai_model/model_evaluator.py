@@ -0,0 +1,144 @@
+"""
+ModelEvaluator class is responsible for measuring quality of classification of trained model
+on labeled images: test dataset or replayed recordings of drives.
+"""
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class ModelEvaluator:
+    """
+    Class runs the model on batches of images in inference mode (no autograd graph is built)
+    and accumulates per-class confusion matrix and cross entropy loss on device, so results
+    are copied to CPU only once, after the last batch. Labels of images are indices of classes.
+    Images labeled as UNLABELED are only classified and aren't counted in statistics.
+    """
+
+    UNLABELED = -1
+
+    def __init__(self, classes: list, device: torch.device,
+                 memory_format: torch.memory_format = torch.preserve_format):
+        self._classes = classes
+        self._device = device
+        self._memory_format = memory_format
+
+
+    def evaluate(self, model: nn.Module, batches, keep_predictions: bool = False) \
+            -> "EvaluationResult":
+        """
+        Evaluate the model on batches given as iterable of (images, labels), e.g. data loader.
+        With keep_predictions, indices of predicted classes of all images are kept in result.
+        """
+        classes_amount = len(self._classes)
+        confusion_matrix = torch.zeros(classes_amount * classes_amount, dtype=torch.int64,
+                                       device=self._device)
+        loss_sum = torch.zeros((), dtype=torch.float64, device=self._device)
+        predictions = []
+
+        model.eval()
+        with torch.inference_mode():
+            for images, labels in batches:
+                images = images.to(self._device, non_blocking=True)
+                images = images.contiguous(memory_format=self._memory_format)
+                labels = labels.to(self._device, non_blocking=True)
+
+                outputs = model(images).to(self._device).float()
+                predicted_classes = outputs.argmax(1)
+                if keep_predictions:
+                    predictions.append(predicted_classes.cpu())
+
+                is_labeled = labels != self.UNLABELED
+                loss_sum += F.cross_entropy(outputs, labels, ignore_index=self.UNLABELED,
+                                            reduction="sum")
+                confusion_matrix += torch.bincount(
+                    labels[is_labeled] * classes_amount + predicted_classes[is_labeled],
+                    minlength=classes_amount * classes_amount
+                )
+
+        confusion_matrix = confusion_matrix.view(classes_amount, classes_amount).cpu()
+        predictions = torch.cat(predictions).tolist() if predictions else []
+
+        return EvaluationResult(self._classes, confusion_matrix, loss_sum.item(), predictions)
+
+
+class EvaluationResult:
+    """
+    Class stores result of evaluation: confusion matrix (rows are true classes, columns are
+    predicted classes), sum of loss and predictions, and computes statistics from them.
+    """
+
+    def __init__(self, classes: list, confusion_matrix: torch.Tensor, loss_sum: float,
+                 predictions: list):
+        self._classes = classes
+        self._confusion_matrix = confusion_matrix
+        self._loss_sum = loss_sum
+        self._predictions = predictions
+
+
+    def get_samples_amount(self) -> int:
+        """Amount of evaluated labeled images getter."""
+        return int(self._confusion_matrix.sum())
+
+
+    def get_accuracy(self) -> float:
+        """Ratio of correctly classified labeled images."""
+        return int(self._confusion_matrix.trace()) / max(1, self.get_samples_amount())
+
+
+    def get_average_loss(self) -> float:
+        """Average cross entropy loss of labeled image."""
+        return self._loss_sum / max(1, self.get_samples_amount())
+
+
+    def get_precision(self) -> list:
+        """
+        Precision of each class: ratio of correct predictions among images predicted
+        as the class.
+        """
+        predicted_amounts = self._confusion_matrix.sum(0).clamp(min=1)
+        return (self._confusion_matrix.diagonal() / predicted_amounts).tolist()
+
+
+    def get_recall(self) -> list:
+        """
+        Recall of each class: ratio of correct predictions among images labeled as the class.
+        """
+        labeled_amounts = self._confusion_matrix.sum(1).clamp(min=1)
+        return (self._confusion_matrix.diagonal() / labeled_amounts).tolist()
+
+
+    def get_confusion_matrix(self) -> torch.Tensor:
+        """Confusion matrix getter."""
+        return self._confusion_matrix
+
+
+    def get_predictions(self) -> list:
+        """Indices of predicted classes of all evaluated images getter."""
+        return self._predictions
+
+
+    def print_report(self, title: str, with_classes: bool = True):
+        """
+        Print accuracy and loss, and optionally precision and recall of each class
+        with confusion matrix.
+        """
+        print(f"{title} stats:")
+        print(f"    {title} accuracy: {self.get_accuracy():.4f}")
+        print(f"    Avg {title.lower()} loss: {self.get_average_loss():.4f}")
+        if not with_classes:
+            return
+
+        width = max(len(name) for name in self._classes) + 4
+        print(f"    {'class':<{width}} {'precision':>10} {'recall':>10} {'images':>8}")
+        for name, precision, recall, amount in zip(self._classes, self.get_precision(),
+                                                   self.get_recall(),
+                                                   self._confusion_matrix.sum(1).tolist()):
+            print(f"    {name:<{width}} {precision:>10.4f} {recall:>10.4f} {amount:>8}")
+
+        print("    Confusion matrix (rows - true class, columns - predicted class):")
+        print(f"    {'':<{width}}" + "".join(f"{index:>8}" for index in range(len(self._classes))))
+        for index, (name, row) in enumerate(zip(self._classes,
+                                                self._confusion_matrix.tolist())):
+            print(f"    {f'{index} {name}':<{width}}" + "".join(f"{amount:>8}" for amount in row))
@@ -0,0 +1,116 @@
+"""
+ModelExporter class is responsible for exporting trained model into TorchScript or ONNX
+artifact, which can be loaded without class definition of the model and executed by optimized
+runtime.
+"""
+
+import json
+import torch
+
+try:
+    import onnx
+except ImportError:
+    onnx = None
+
+
+class ModelExporter:
+    """
+    Class exports trained model for inference on CPU. TorchScript artifact is traced and frozen
+    module (weights inlined as constants), so it's ready for operator fusion when loaded.
+    ONNX artifact has dynamic batch dimension.
+    Input size and classes of the model are saved in both artifacts: as extra file of
+    TorchScript module and as metadata properties of ONNX model. onnx module is optional
+    dependency, required only to export .onnx models.
+    """
+
+    EXTENSIONS = {"torchscript": ".ts", "onnx": ".onnx"}
+    _METADATA_FILE = "metadata.json"
+
+    def __init__(self, input_size: tuple):
+        self._input_size = input_size
+
+
+    def export(self, model: torch.nn.Module, export_format: str, path: str,
+               classes: list = None):
+        """
+        Export model in given format ('torchscript' or 'onnx') into file of given path.
+        Classes (labels of model outputs) are saved with exported model.
+        """
+        model = model.cpu().eval()
+        example_input = torch.randn(1, 3, *self._input_size)
+        match export_format:
+            case "torchscript":
+                self._export_torchscript(model, example_input, path, classes)
+            case "onnx":
+                self._export_onnx(model, example_input, path, classes)
+            case _:
+                raise ValueError(f"Unknown export format: {export_format}")
+
+        print(f"Model exported in {path}")
+
+
+    def _export_torchscript(self, model: torch.nn.Module, example_input: torch.Tensor, path: str,
+                            classes: list):
+        with torch.no_grad():
+            scripted_model = torch.jit.freeze(torch.jit.trace(model, example_input))
+        torch.jit.save(scripted_model, path,
+                       _extra_files={ModelExporter._METADATA_FILE: self._dump_metadata(classes)})
+
+
+    def _export_onnx(self, model: torch.nn.Module, example_input: torch.Tensor, path: str,
+                     classes: list):
+        if onnx is None:
+            raise ImportError("onnx module is required to export .onnx models")
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                example_input,
+                path,
+                input_names=["image"],
+                output_names=["output"],
+                dynamic_axes={"image": {0: "batch"}, "output": {0: "batch"}},
+                opset_version=17
+            )
+
+        onnx_model = onnx.load(path)
+        metadata_property = onnx_model.metadata_props.add()
+        metadata_property.key = ModelExporter._METADATA_FILE
+        metadata_property.value = self._dump_metadata(classes)
+        onnx.save(onnx_model, path)
+
+
+    def _dump_metadata(self, classes: list) -> str:
+        return json.dumps({"input_size": list(self._input_size), "classes": classes})
+
+
+    @staticmethod
+    def create_metadata_files() -> dict:
+        """
+        Dictionary to pass as _extra_files to torch.jit.load, which is filled with metadata
+        saved with TorchScript model.
+        """
+        return {ModelExporter._METADATA_FILE: ""}
+
+
+    @staticmethod
+    def read_metadata(metadata_files: dict) -> dict:
+        """
+        Metadata saved with exported model: input_size and classes. Takes extra files of
+        TorchScript model or metadata properties of ONNX model. Returns empty dictionary if model
+        has no metadata.
+        """
+        metadata = metadata_files.get(ModelExporter._METADATA_FILE)
+        if not metadata:
+            return {}
+
+        return json.loads(metadata)
+
+
+    @staticmethod
+    def get_artifact_name(model_name: str, export_format: str) -> str:
+        """
+        Name of exported artifact: name of the model with extension of export format.
+        """
+        base_name = model_name.rsplit(".", 1)[0] if model_name.endswith(".pt") else model_name
+        return base_name + ModelExporter.EXTENSIONS[export_format]
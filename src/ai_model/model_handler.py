@@ -3,19 +3,35 @@ ModelHandler class is responsible for handling AI model.
 """
 
 import os
+import csv
+import math
+import copy
+import time
 from pathlib import Path
-from io import BytesIO
-from PIL import Image, ImageFile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import ImageFile
 import torch
 import torch.nn as nn
 import torch.optim as optim
-import torchvision.transforms as transforms
-from torchvision.datasets import ImageFolder
+import torch.nn.functional as F
 from torch.utils.data import DataLoader
-import requests
 
-from ai_model.neural_network_model import NeuralNetworkModel
+from ai_model.architecture_registry import ArchitectureRegistry
+from ai_model.fast_preprocessor import FastPreprocessor
+from ai_model.model_exporter import ModelExporter
+from ai_model.onnx_runtime_model import OnnxRuntimeModel
+from ai_model.model_quantizer import ModelQuantizer
+from ai_model.model_statistics import ModelStatistics
+from ai_model.channel_pruner import ChannelPruner
+from ai_model.distillation_loss import DistillationLoss
+from ai_model.dataset_cache import DatasetCache
+from ai_model.batch_augmenter import BatchAugmenter
+from ai_model.model_evaluator import ModelEvaluator
 from predicted_class import PredictedClass
+from dataset_manifest import DatasetManifest
+from settings_readers.training_settings_reader import TrainingSettingsReader
+from frame import Frame
+from latency_profiler import LatencyProfiler
 from label_class_mapper import LabelClassMapper
 from date_to_str import DateToStr, DateNameType
 from commandline_args_parser import CommandLineArgsParser
@@ -29,28 +45,64 @@ class ModelHandler:
     collected by robotic car, training neural networks and classyfing images.
     """
 
-    def __init__(self, commandline_args_parser: CommandLineArgsParser):
+    def __init__(self, commandline_args_parser: CommandLineArgsParser,
+                 workers_amount: int = None, refresh_dataset_manifest: bool = True):
         self._set_workspace()
+        self._refresh_dataset_manifest = refresh_dataset_manifest
         self._select_device()
         self._create_paths_to_datasets()
 
         self._path_to_models_directory = "trained_models/"
-
-        self._define_transform()
-        self._load_datasets()
-        self._classes_amount = len(self._train_dataset.classes)
+        self._path_to_checkpoints_directory = f"{self._path_to_models_directory}checkpoints/"
+
+        self._architecture = commandline_args_parser.get_architecture()
+        self._input_size = ArchitectureRegistry.get_input_size(self._architecture)
+        self._model_name = commandline_args_parser.get_model()
+        self._export_format = commandline_args_parser.get_export()
+        self._quantization_method = commandline_args_parser.get_quantize()
+        self._width_multiplier = commandline_args_parser.get_width()
+        self._pruning_ratio = commandline_args_parser.get_prune()
+        self._learning_rate = commandline_args_parser.get_lr()
+        self._optimizer_name = commandline_args_parser.get_optimizer()
+        self._name = commandline_args_parser.get_name()
+        self._teacher = None
+        self._classes = None
+        self._resumed_checkpoint = None
+        self._memory_format = torch.preserve_format
+        if commandline_args_parser.get_mode() in ("run", "evaluate", "export"):
+            try:
+                self._load_model(self._model_name)
+            except FileNotFoundError as ex:
+                raise ex
+        if commandline_args_parser.get_mode() == "train" and commandline_args_parser.get_teacher():
+            self._load_teacher(commandline_args_parser.get_teacher())
+        if commandline_args_parser.get_mode() == "train" and commandline_args_parser.get_resume():
+            self._read_training_checkpoint(commandline_args_parser.get_resume())
+
+        self._fast_preprocessor = FastPreprocessor(self._input_size)
+        self._frame_tensor = self._fast_preprocessor.create_output().unsqueeze(0)
+        self._model_exporter = ModelExporter(self._input_size)
+        self._model_quantizer = ModelQuantizer(self._input_size)
         if commandline_args_parser.get_mode() == "train":
             self._epochs_amount = commandline_args_parser.get_epochs()
             self._batch_size = commandline_args_parser.get_batch()
+            self._patience = commandline_args_parser.get_patience()
 
+            self._import_from_training_settings()
+            if workers_amount is not None:
+                self._workers_amount = workers_amount
+            self._load_datasets()
             self._create_data_loaders()
             self._init_model()
-        if commandline_args_parser.get_mode() == "run":
-            model_name = commandline_args_parser.get_model()
-            try:
-                self._load_model(model_name)
-            except FileNotFoundError as ex:
-                raise ex
+        elif self._classes is None:
+            self._classes = self._dataset_manifest.get_classes(self._train_subset)
+        if commandline_args_parser.get_mode() == "evaluate":
+            self._batch_size = commandline_args_parser.get_batch() or 32
+        self._model_evaluator = ModelEvaluator(self._classes, self._device, self._memory_format)
+
+        self._profiler = LatencyProfiler()
+        self._decode_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._evaluated_extensions = (".jpg", ".jpeg", ".png")
 
 
     def _set_workspace(self):
@@ -64,53 +116,136 @@ class ModelHandler:
 
     def _create_paths_to_datasets(self):
         path_to_datasets = "../../dataset/"
-        train_dataset_subdirectory = "train"
-        test_dataset_subdirectory = "test"
-
-        self._train_dataset_directory = f"{path_to_datasets}{train_dataset_subdirectory}"
-        self._test_dataset_directory = f"{path_to_datasets}{test_dataset_subdirectory}"
 
-
-    def _define_transform(self):
-        self._transform = transforms.Compose([
-            transforms.Resize((128, 128)),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-        ])
+        self._train_subset = "train"
+        self._test_subset = "test"
+        self._dataset_cache_directory = f"{path_to_datasets}cache"
+        self._dataset_manifest = DatasetManifest(path_to_datasets)
 
 
     def _load_datasets(self):
-        self._train_dataset = ImageFolder(
-            root=self._train_dataset_directory,
-            transform=self._transform
+        """
+        Load train and test datasets. Dataset manifest is synchronized with dataset directory
+        (unless it was already synchronized by caller, e.g. hyperparameter sweep) and images
+        preprocessed once into memory-mapped cache are used, so they aren't decoded again in
+        every epoch. Classes are labels of train dataset. Train images are loaded as uint8
+        batches, which are augmented and normalized on training device.
+        """
+        if self._refresh_dataset_manifest:
+            self._dataset_manifest.refresh()
+        self._classes = self._dataset_manifest.get_classes(self._train_subset)
+        self._classes_amount = len(self._classes)
+
+        dataset_cache = DatasetCache(self._dataset_cache_directory, self._input_size)
+        self._train_dataset = dataset_cache.load(
+            self._train_subset,
+            self._classes,
+            self._dataset_manifest.get_entries(self._train_subset),
+            normalize=False
         )
-        self._test_dataset = ImageFolder(
-            root=self._test_dataset_directory,
-            transform=self._transform
+        self._test_dataset = dataset_cache.load(
+            self._test_subset,
+            self._classes,
+            self._dataset_manifest.get_entries(self._test_subset)
         )
+        self._batch_augmenter = BatchAugmenter(self._classes, self._is_augmentation_enabled)
+
+
+    def _import_from_training_settings(self):
+        training_settings_reader = TrainingSettingsReader()
+        training_settings_reader.read()
+        self._set_workspace()
+        self._is_throughput_mode = training_settings_reader.get_throughput_mode()
+        self._workers_amount = training_settings_reader.get_workers()
+        self._persistent_workers = training_settings_reader.get_persistent_workers()
+        self._prefetch_factor = training_settings_reader.get_prefetch_factor()
+        self._pin_memory = training_settings_reader.get_pin_memory()
+        self._is_augmentation_enabled = training_settings_reader.get_augmentation()
+
+        # In throughput mode convolutions run on channels last tensors in bfloat16.
+        self._memory_format = (torch.channels_last if self._is_throughput_mode
+                               else torch.preserve_format)
 
 
     def _create_data_loaders(self):
-        self._train_loader = DataLoader(
-            dataset=self._train_dataset,
-            batch_size=self._batch_size,
-            shuffle=True,
-            num_workers=8,
-            pin_memory=True
-        )
-        self._test_loader = DataLoader(
-            dataset=self._test_dataset,
+        self._train_loader = self._create_data_loader(self._train_dataset, shuffle=True)
+        self._test_loader = self._create_data_loader(self._test_dataset, shuffle=False)
+
+
+    def _create_data_loader(self, dataset, shuffle: bool) -> DataLoader:
+        has_workers = self._workers_amount > 0
+        return DataLoader(
+            dataset=dataset,
             batch_size=self._batch_size,
-            shuffle=False,
-            num_workers=8,
-            pin_memory=True
+            shuffle=shuffle,
+            num_workers=self._workers_amount,
+            pin_memory=self._pin_memory and self._device.type == "cuda",
+            persistent_workers=self._persistent_workers and has_workers,
+            prefetch_factor=self._prefetch_factor if has_workers else None
         )
 
 
     def _init_model(self):
-        self._model = NeuralNetworkModel(self._classes_amount).to(self._device)
+        if self._resumed_checkpoint is not None:
+            self._model_parameters = self._resumed_checkpoint["model"]["parameters"]
+            self._model = ArchitectureRegistry.create_model_from_checkpoint(
+                self._resumed_checkpoint["model"]
+            )
+        elif self._teacher is not None and self._pruning_ratio:
+            self._model, self._model_parameters = ChannelPruner(self._pruning_ratio).prune(
+                self._teacher,
+                self._teacher_parameters or {"classes_amount": self._classes_amount}
+            )
+        else:
+            self._model_parameters = ArchitectureRegistry.create_parameters(
+                self._architecture,
+                self._classes_amount,
+                self._width_multiplier
+            )
+            self._model = ArchitectureRegistry.create_model(
+                self._architecture,
+                self._model_parameters
+            )
+        self._model.to(self._device, memory_format=self._memory_format)
         self._criterion = nn.CrossEntropyLoss()
-        self._optimizer = optim.Adam(self._model.parameters(), lr=0.001)
+        self._distillation_loss = DistillationLoss()
+        self._optimizer = self._create_optimizer()
+        self._init_training_state()
+
+
+    def _create_optimizer(self) -> optim.Optimizer:
+        match self._optimizer_name:
+            case "sgd":
+                return optim.SGD(self._model.parameters(), lr=self._learning_rate, momentum=0.9)
+            case "adamw":
+                return optim.AdamW(self._model.parameters(), lr=self._learning_rate)
+            case _:
+                return optim.Adam(self._model.parameters(), lr=self._learning_rate)
+
+
+    def _init_training_state(self):
+        """
+        Initialize state of training: first epoch, history of metrics and best test loss,
+        or restore them (with state of optimizer) from resumed training checkpoint.
+        """
+        if self._resumed_checkpoint is None:
+            name_based_on_time = DateToStr.parse_date(DateNameType.DATE_HOUR_MINUTE)
+            self._training_name = self._name or (f"{self._architecture}_batch_{self._batch_size}"
+                                                 f"_{name_based_on_time}")
+            self._start_epoch = 0
+            self._metrics_history = []
+            self._best_epoch = None
+            self._best_test_loss = float("inf")
+            return
+
+        checkpoint = self._resumed_checkpoint
+        self._optimizer.load_state_dict(checkpoint["optimizer"])
+        self._training_name = checkpoint["training_name"]
+        self._start_epoch = checkpoint["epoch"] + 1
+        self._metrics_history = checkpoint["metrics"]
+        self._best_epoch = checkpoint["best_epoch"]
+        self._best_test_loss = checkpoint["best_test_loss"]
+        print(f"Training {self._training_name} resumed from epoch {self._start_epoch + 1}")
 
 
     def train_model(self):
@@ -124,112 +259,521 @@ class ModelHandler:
         self._train()
 
         print("Test after training")
-        self._test()
+        self._test_accuracy, self._test_loss = self._test(with_classes=True)
 
         self._save_model()
+        if self._teacher is not None:
+            self._compare_with_teacher()
+        if self._export_format:
+            self.export_model()
+        if self._quantization_method:
+            self.quantize_model()
+
+
+    def get_training_result(self) -> dict:
+        """
+        Result of finished training: name of saved model, its architecture, size of input
+        images, test accuracy and loss, and amount of trained epochs.
+        """
+        return {
+            "model": self._model_name,
+            "architecture": self._architecture,
+            "input_size": list(self._input_size),
+            "test_accuracy": self._test_accuracy,
+            "test_loss": self._test_loss,
+            "epochs": len(self._metrics_history),
+        }
 
 
     def _train(self):
-        """Model training"""
-        for epoch in range(self._epochs_amount):
+        """
+        Model training. Model is tested after every epoch and training checkpoint is saved,
+        so training can be resumed. Model with the lowest test loss is kept as the best one
+        and training stops early, if test loss didn't improve for patience epochs.
+        When training finishes, weights of the best model are restored.
+        """
+        if self._is_throughput_mode:
+            print("Throughput mode: bfloat16 autocast, channels last")
+        for epoch in range(self._start_epoch, self._epochs_amount):
             print(f"Epoch {epoch + 1} starts")
 
-            train_accuracy, avg_train_loss = self._epoch_train()
+            train_accuracy, avg_train_loss, images_per_second = self._epoch_train()
 
             print(f"Epoch [{epoch + 1}/{self._epochs_amount}] stats:")
             print(f"    Train accuracy: {train_accuracy:.4f}")
             print(f"    Avg train loss: {avg_train_loss:.4f}")
+            print(f"    Images per second: {images_per_second:.1f}")
+
+            test_accuracy, avg_test_loss = self._test()
+            self._metrics_history.append({
+                "epoch": epoch + 1,
+                "train_accuracy": train_accuracy,
+                "train_loss": avg_train_loss,
+                "test_accuracy": test_accuracy,
+                "test_loss": avg_test_loss,
+                "images_per_second": images_per_second,
+            })
+            # Non-finite test loss (e.g. diverged training) is never an improvement.
+            if math.isfinite(avg_test_loss) and avg_test_loss < self._best_test_loss:
+                self._best_test_loss = avg_test_loss
+                self._best_epoch = epoch
+                self._save_best_model()
+            self._save_training_checkpoint(epoch)
+
+            last_improved_epoch = (self._best_epoch if self._best_epoch is not None
+                                   else self._start_epoch - 1)
+            if self._patience and epoch - last_improved_epoch >= self._patience:
+                print(f"Test loss didn't improve for {self._patience} epochs. Stopping early.")
+                break
+
+        self._restore_best_model()
+
+
+    def _get_training_directory(self) -> str:
+        return f"{self._path_to_checkpoints_directory}{self._training_name}/"
+
+
+    def _save_training_checkpoint(self, epoch: int):
+        """
+        Save state of training after given epoch: model, optimizer, metrics and best epoch.
+        File is replaced atomically, so interrupted save doesn't corrupt previous checkpoint.
+        """
+        checkpoint = {
+            "training_name": self._training_name,
+            "epoch": epoch,
+            "model": self._create_model_checkpoint(),
+            "optimizer": self._optimizer.state_dict(),
+            "optimizer_name": self._optimizer_name,
+            "metrics": self._metrics_history,
+            "best_epoch": self._best_epoch,
+            "best_test_loss": self._best_test_loss,
+        }
+        self._save_atomically(checkpoint, f"{self._get_training_directory()}last.pt")
+
+
+    def _save_best_model(self):
+        self._save_atomically(self._create_model_checkpoint(),
+                              f"{self._get_training_directory()}best.pt")
+
+
+    def _save_atomically(self, checkpoint: dict, path: str):
+        self._set_workspace()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        torch.save(checkpoint, temporary_path)
+        os.replace(temporary_path, path)
+
+
+    def _restore_best_model(self):
+        if self._best_epoch is None or self._best_epoch + 1 == len(self._metrics_history):
+            return
+
+        self._set_workspace()
+        best_model = torch.load(f"{self._get_training_directory()}best.pt",
+                                map_location=self._device, weights_only=False)
+        self._model.load_state_dict(best_model["state_dict"])
+        print(f"Restored best model from epoch {self._best_epoch + 1} "
+              f"(test loss {self._best_test_loss:.4f})")
+
+
+    def _read_training_checkpoint(self, training_name: str):
+        """
+        Read last checkpoint of interrupted training. Training is resumed with architecture
+        and size of input images of checkpointed model.
+        """
+        self._set_workspace()
+        path = f"{self._path_to_checkpoints_directory}{training_name}/last.pt"
+        self._resumed_checkpoint = torch.load(path, map_location=self._device,
+                                              weights_only=False)
+        self._architecture = self._resumed_checkpoint["model"]["architecture"]
+        self._input_size = tuple(self._resumed_checkpoint["model"]["input_size"])
+        self._optimizer_name = self._resumed_checkpoint["optimizer_name"]
 
 
     def _epoch_train(self):
+        """
+        Train model for one epoch. Loss and amount of correct predictions are accumulated on
+        device, so they are synchronized only once per epoch.
+        """
         self._model.train()
-        train_loss = 0
-        correct_samples = 0
+        train_loss = torch.zeros((), device=self._device)
+        correct_samples = torch.zeros((), dtype=torch.long, device=self._device)
         total_samples = 0
+        epoch_start = time.perf_counter()
 
         for images, labels in self._train_loader:
-            images, labels = images.to(self._device), labels.to(self._device)
-
-            self._optimizer.zero_grad()
-            outputs = self._model(images)
-            loss = self._criterion(outputs, labels)
+            images = images.to(self._device, non_blocking=True)
+            labels = labels.to(self._device, non_blocking=True)
+            images, labels = self._batch_augmenter.augment(images, labels)
+            images = images.contiguous(memory_format=self._memory_format)
+
+            self._optimizer.zero_grad(set_to_none=True)
+            with torch.autocast(device_type=self._device.type, dtype=torch.bfloat16,
+                                enabled=self._is_throughput_mode):
+                outputs = self._model(images)
+                loss = self._compute_loss(images, outputs, labels)
             loss.backward()
             self._optimizer.step()
-            train_loss += loss.item()
-            _, predicted = outputs.max(1)
+            train_loss += loss.detach()
             total_samples += labels.size(0)
-            correct_samples += predicted.eq(labels).sum().item()
+            correct_samples += (outputs.argmax(1) == labels).sum()
 
-        train_accuracy = correct_samples / total_samples
-        avg_train_loss = train_loss/len(self._train_loader)
+        train_accuracy = correct_samples.item() / total_samples
+        avg_train_loss = train_loss.item() / len(self._train_loader)
+        images_per_second = total_samples / (time.perf_counter() - epoch_start)
 
-        return (train_accuracy, avg_train_loss)
+        return (train_accuracy, avg_train_loss, images_per_second)
 
 
-    def _test(self):
-        """Model testing"""
-        self._model.eval()
-        test_loss = 0
-        test_correct = 0
-        test_samples = 0
+    def _compute_loss(self, images: torch.Tensor, outputs: torch.Tensor,
+                      labels: torch.Tensor) -> torch.Tensor:
+        """
+        Cross entropy loss, or distillation loss if model is trained with teacher. Images are
+        resized for teacher, if it takes other size of input images than trained model.
+        """
+        if self._teacher is None:
+            return self._criterion(outputs, labels)
 
-        for images, labels in self._test_loader:
-            images, labels = images.to(self._device), labels.to(self._device)
+        if self._teacher_input_size != self._input_size:
+            images = F.interpolate(images, size=self._teacher_input_size, mode="bilinear",
+                                   align_corners=False)
+        with torch.no_grad():
+            teacher_outputs = self._teacher(images)
 
-            outputs = self._model(images)
-            loss = self._criterion(outputs, labels)
-            loss.backward()
-            test_loss += loss.item()
-            _, predicted_class = torch.max(outputs, 1)
-            test_correct += (predicted_class == labels).sum().item()
-            test_samples += labels.size(0)
+        return self._distillation_loss(outputs, teacher_outputs, labels)
 
-        test_accuracy = test_correct / test_samples
-        avg_test_loss = test_loss/len(self._test_loader)
 
-        print("Test stats:")
-        print(f"    Test accuracy: {test_accuracy:.4f}")
-        print(f"    Avg test loss: {avg_test_loss:.4f}")
+    def _test(self, with_classes: bool = False) -> (float, float):
+        """
+        Model testing in inference mode. Returns test accuracy and average test loss.
+        With with_classes, precision and recall of each class and confusion matrix
+        are printed as well.
+        """
+        result = self._model_evaluator.evaluate(self._model, self._test_loader)
+        result.print_report("Test", with_classes)
 
+        return (result.get_accuracy(), result.get_average_loss())
 
-    def classify_image(self, response: requests.models.Response) -> PredictedClass:
-        """Image classification based on trained model."""
-        image = Image.open(BytesIO(response.content)).convert('RGB')
-        image = self._transform(image).unsqueeze(0).to(self._device)
 
-        self._model.eval()
+    def _preprocess_image(self, content: memoryview, output: torch.Tensor) -> float:
+        """
+        Decode .jpg image and write it as normalized tensor into output. Returns decode time
+        in seconds.
+        """
+        decode_start = time.perf_counter()
+        with self._profiler.measure("jpeg decode"):
+            image = self._fast_preprocessor.decode(content)
+        decode_time_s = time.perf_counter() - decode_start
+        with self._profiler.measure("transform"):
+            self._fast_preprocessor.transform(image, output)
 
-        with torch.no_grad():
+        return decode_time_s
+
+
+    def _predict_frame_tensor(self) -> torch.Tensor:
+        image = self._frame_tensor.to(self._device)
+
+        with self._profiler.measure("forward pass"), torch.inference_mode():
             output = self._model(image)
 
-        _, predicted_class = torch.max(output, 1)
-        predicted_class = predicted_class.item()
+        return torch.softmax(output[0].float(), dim=0).cpu()
+
+
+    def predict_frame(self, frame: Frame) -> torch.Tensor:
+        """
+        Probabilities of classes (softmax of output of the model) of frame received from
+        robotic car. Order of classes is the same as in get_predicted_classes(). Age of the
+        frame at inference start and its decode time are stored in the frame.
+        """
+        frame.mark_inference_start()
+        frame.set_decode_time(self._preprocess_image(frame.get_content(), self._frame_tensor[0]))
+
+        return self._predict_frame_tensor()
+
+
+    def get_predicted_classes(self) -> list:
+        """
+        Predicted classes corresponding to outputs of the model getter.
+        """
+        return [LabelClassMapper.map_label_to_class(label) for label in self._classes]
+
+
+    def set_profiler(self, profiler: LatencyProfiler):
+        """Profiler measuring decoding, transform and forward pass setter."""
+        self._profiler = profiler
+
+
+    def classify_batch(self, contents: list) -> list:
+        """
+        Classification of many .jpg images stored in bytes. Images are decoded in parallel
+        and classified with single forward pass of the model.
+        """
+        batch = self._preprocess_batch(contents).to(self._device)
+
+        with torch.inference_mode():
+            output = self._model(batch)
+
+        _, predicted_classes = torch.max(output, 1)
 
-        predicted_label = self._train_dataset.classes[predicted_class]
-        predicted = LabelClassMapper.map_label_to_class(predicted_label)
+        return [self._map_output_index_to_class(index) for index in predicted_classes.tolist()]
 
-        return predicted
+
+    def _preprocess_batch(self, contents: list) -> torch.Tensor:
+        batch = self._fast_preprocessor.create_output(len(contents))
+        list(self._decode_executor.map(self._preprocess_image, contents, batch))
+
+        return batch
+
+
+    def _map_output_index_to_class(self, index: int) -> PredictedClass:
+        predicted_label = self._classes[index]
+        return LabelClassMapper.map_label_to_class(predicted_label)
+
+
+    def evaluate_directory(self, directory: str):
+        """
+        Classify all images stored in directory (including subdirectories) in batches.
+        Prediction for each file is saved in .csv file in evaluated directory and amount of
+        images predicted for each class is printed on console.
+        Images stored in subdirectories named as classes (e.g. replayed recording sorted
+        like dataset: forward/img_1.jpg) are labeled, so accuracy, precision and recall
+        of each class and confusion matrix are printed as well.
+        """
+        paths = self._find_images_to_evaluate(directory)
+        if not paths:
+            print(f"No images to evaluate in {directory}")
+            return
+
+        print(f"Evaluating {len(paths)} images from {directory}")
+        labels = self._read_labels_of_evaluated_images(directory, paths)
+        result = self._model_evaluator.evaluate(
+            self._model,
+            self._read_evaluated_batches(paths, labels),
+            keep_predictions=True
+        )
+        predictions = [self._map_output_index_to_class(index)
+                       for index in result.get_predictions()]
+
+        name_based_on_time = DateToStr.parse_date(DateNameType.DATE_HOUR_MINUTE_SECONDS)
+        results_path = os.path.join(directory, f"evaluation_{name_based_on_time}.csv")
+        with open(file=results_path, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["file", "predicted_class"])
+            for path, predicted in zip(paths, predictions):
+                writer.writerow([os.path.relpath(path, directory), predicted.name])
+
+        print("Evaluation stats:")
+        for predicted_class in PredictedClass:
+            print(f"    {predicted_class.name}: {predictions.count(predicted_class)}")
+        if result.get_samples_amount():
+            print(f"Labeled images: {result.get_samples_amount()}")
+            result.print_report("Evaluation")
+        print(f"Predictions saved in {results_path}")
+
+
+    def _read_labels_of_evaluated_images(self, directory: str, paths: list) -> list:
+        labels = []
+        for path in paths:
+            label = Path(os.path.relpath(path, directory)).parts[0]
+            if label in self._classes:
+                labels.append(self._classes.index(label))
+            else:
+                labels.append(ModelEvaluator.UNLABELED)
+
+        return labels
+
+
+    def _read_evaluated_batches(self, paths: list, labels: list):
+        for batch_start in range(0, len(paths), self._batch_size):
+            batch_paths = paths[batch_start:batch_start + self._batch_size]
+            contents = [Path(path).read_bytes() for path in batch_paths]
+            batch_labels = torch.tensor(labels[batch_start:batch_start + self._batch_size])
+            yield (self._preprocess_batch(contents), batch_labels)
+
+
+    def _find_images_to_evaluate(self, directory: str) -> list:
+        paths = []
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.lower().endswith(self._evaluated_extensions):
+                    paths.append(os.path.join(root, filename))
+
+        return sorted(paths)
 
 
     def _save_model(self):
         name_based_on_time = DateToStr.parse_date(DateNameType.DATE_HOUR_MINUTE)
-        filename = f"epochs_{self._epochs_amount}_batch_{self._batch_size}_{name_based_on_time}.pt"
+        filename = (f"{self._name}.pt" if self._name else
+                    f"{self._architecture}_epochs_{self._epochs_amount}_batch_{self._batch_size}"
+                    f"_{name_based_on_time}.pt")
         model_path = self._path_to_models_directory + filename
 
         self._set_workspace()
-        torch.save(self._model, model_path)
+        torch.save(self._create_model_checkpoint(), model_path)
+        self._model_name = filename
         print(f"Model saved in {model_path}")
 
 
+    def _create_model_checkpoint(self) -> dict:
+        return ArchitectureRegistry.create_checkpoint(
+            self._architecture,
+            self._model_parameters,
+            self._model,
+            self._input_size,
+            self._classes
+        )
+
+
+    def export_model(self):
+        """
+        Export trained or loaded model into TorchScript (.ts) or ONNX (.onnx) artifact,
+        which is saved next to the model in trained_models directory.
+        """
+        artifact_name = ModelExporter.get_artifact_name(self._model_name, self._export_format)
+        artifact_path = self._path_to_models_directory + artifact_name
+
+        self._set_workspace()
+        self._model_exporter.export(self._model, self._export_format, artifact_path,
+                                    self._classes)
+        self._model.to(self._device)
+
+
+    def quantize_model(self):
+        """
+        Quantize trained model into int8 (static quantization is calibrated on test dataset),
+        compare it with float32 model and save it as TorchScript (.ts) model, which can be
+        used in run mode.
+        """
+        print(f"Quantizing model ({self._quantization_method})...")
+        quantized_model = self._model_quantizer.quantize(
+            self._model,
+            self._quantization_method,
+            self._test_loader
+        )
+        self._model_quantizer.compare(self._model, quantized_model, self._test_loader)
+
+        quantized_model_name = ModelQuantizer.get_quantized_model_name(
+            self._model_name,
+            self._quantization_method
+        )
+        self._set_workspace()
+        self._model_exporter.export(
+            quantized_model,
+            "torchscript",
+            self._path_to_models_directory + quantized_model_name,
+            self._classes
+        )
+
+
+    def _optimize_scripted_model(self):
+        """
+        Fuse operators of loaded TorchScript model. Quantized model is left as it was saved
+        (frozen), if its operators can't be optimized.
+        """
+        try:
+            self._model = torch.jit.optimize_for_inference(self._model)
+        except RuntimeError as ex:
+            print(f"TorchScript model not optimized: {ex}")
+
+
     def _load_model(self, model_name: str="") -> bool:
+        """
+        Load model based on extension of its file: .pt is checkpoint from which model of saved
+        architecture is rebuilt (or legacy pickled torch module), .ts is TorchScript module
+        optimized for inference (frozen and fused) when loaded and .onnx is run by ONNX Runtime
+        with all graph optimizations. Size of input images is taken from loaded model.
+        """
         self._set_workspace()
         path = self._path_to_models_directory + model_name
+        load_start = time.perf_counter()
         try:
-            self._model = torch.load(path)
+            if model_name.endswith(".ts"):
+                if not os.path.isfile(path):
+                    raise FileNotFoundError(path)
+                metadata = ModelExporter.create_metadata_files()
+                self._model = torch.jit.load(path, map_location=self._device,
+                                             _extra_files=metadata)
+                metadata = ModelExporter.read_metadata(metadata)
+                self._input_size = tuple(metadata.get("input_size", self._input_size))
+                self._classes = metadata.get("classes")
+                self._optimize_scripted_model()
+            elif model_name.endswith(".onnx"):
+                self._model = OnnxRuntimeModel(path)
+                metadata = ModelExporter.read_metadata(self._model.get_metadata_properties())
+                self._input_size = tuple(metadata.get("input_size",
+                                                      self._model.get_input_size()))
+                self._classes = metadata.get("classes")
+            else:
+                self._load_checkpoint(path)
         except FileNotFoundError as ex:
             raise ex
 
-        self._model.eval()
+        print(f"Model loaded in {1000 * (time.perf_counter() - load_start):.1f} ms")
+
+
+    def _load_checkpoint(self, path: str):
+        self._model, checkpoint = self._read_checkpoint(path)
+        if checkpoint is not None:
+            self._architecture = checkpoint["architecture"]
+            self._model_parameters = checkpoint["parameters"]
+            self._input_size = tuple(checkpoint["input_size"])
+            self._classes = checkpoint.get("classes")
+
+
+    def _read_checkpoint(self, path: str) -> (nn.Module, dict):
+        """
+        Read .pt model: checkpoint with architecture, its parameters, input size and classes,
+        or legacy pickled torch module, for which checkpoint is None.
+        """
+        checkpoint = torch.load(path, map_location=self._device, weights_only=False)
+        if isinstance(checkpoint, dict):
+            model = ArchitectureRegistry.create_model_from_checkpoint(checkpoint)
+        else:
+            model = checkpoint
+            checkpoint = None
+        model.to(self._device)
+        model.eval()
+
+        return (model, checkpoint)
+
+
+    def _load_teacher(self, teacher_name: str):
+        """
+        Load trained .pt model as teacher. When teacher is pruned, trained model has teacher's
+        architecture and size of input images.
+        """
+        self._set_workspace()
+        path = self._path_to_models_directory + teacher_name
+        self._teacher, checkpoint = self._read_checkpoint(path)
+        self._teacher_parameters = None
+        self._teacher_input_size = self._input_size
+        if checkpoint is not None:
+            self._teacher_parameters = checkpoint["parameters"]
+            self._teacher_input_size = tuple(checkpoint["input_size"])
+            if self._pruning_ratio:
+                self._architecture = checkpoint["architecture"]
+        for parameter in self._teacher.parameters():
+            parameter.requires_grad = False
+        if self._pruning_ratio:
+            self._input_size = self._teacher_input_size
+        print(f"Teacher loaded from {path}")
+
+
+    def _compare_with_teacher(self):
+        """
+        Print size, FLOPs, test accuracy and single image latency on CPU of teacher and
+        trained student model.
+        """
+        model_statistics = ModelStatistics(self._input_size)
+        teacher = copy.deepcopy(self._teacher).cpu()
+        student = copy.deepcopy(self._model).cpu().eval()
+
+        print("Teacher and student stats:")
+        model_statistics.print_comparison(
+            {"teacher": teacher, "student": student},
+            self._test_loader,
+            input_sizes={"teacher": self._teacher_input_size}
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+ModelQuantizer class is responsible for post-training int8 quantization of trained model
+and comparing accuracy and latency of quantized model with float32 one.
+"""
+
+import copy
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+from torch.ao.quantization import quantize_dynamic, get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+from ai_model.model_statistics import ModelStatistics
+
+
+class ModelQuantizer:
+    """
+    Class quantizes float32 model into int8 on CPU with one of methods:
+        dynamic - weights of Linear layers are stored as int8 and activations are quantized
+                  on the fly, no calibration needed,
+        static - weights and activations of all layers are int8 (convolutions are fused with
+                 ReLU), ranges of activations are calibrated on given data loader.
+    """
+
+    METHODS = ("dynamic", "static")
+
+    def __init__(self, input_size: tuple, calibration_batches_amount: int = 32):
+        self._input_size = input_size
+        self._calibration_batches_amount = calibration_batches_amount
+        self._model_statistics = ModelStatistics(input_size)
+        self._engine = torch.backends.quantized.engine
+
+
+    def quantize(self, model: nn.Module, method: str, calibration_loader: DataLoader) -> nn.Module:
+        """
+        Return int8 copy of the model quantized with given method.
+        """
+        model = copy.deepcopy(model).cpu().eval()
+        match method:
+            case "dynamic":
+                return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+            case "static":
+                return self._quantize_static(model, calibration_loader)
+            case _:
+                raise ValueError(f"Unknown quantization method: {method}")
+
+
+    def _quantize_static(self, model: nn.Module, calibration_loader: DataLoader) -> nn.Module:
+        example_inputs = (torch.randn(1, 3, *self._input_size),)
+        qconfig_mapping = get_default_qconfig_mapping(self._engine)
+        prepared_model = prepare_fx(model, qconfig_mapping, example_inputs)
+
+        with torch.inference_mode():
+            for batch_index, (images, _) in enumerate(calibration_loader):
+                if batch_index >= self._calibration_batches_amount:
+                    break
+                prepared_model(images)
+
+        return convert_fx(prepared_model)
+
+
+    def compare(self, fp32_model: nn.Module, int8_model: nn.Module, test_loader: DataLoader):
+        """
+        Print size, test accuracy and single image latency on CPU of float32 and int8 models.
+        """
+        fp32_model = copy.deepcopy(fp32_model).cpu().eval()
+
+        print("Quantization stats:")
+        self._model_statistics.print_comparison(
+            {"fp32": fp32_model, "int8": int8_model},
+            test_loader,
+            with_flops=False
+        )
+
+
+    @staticmethod
+    def get_quantized_model_name(model_name: str, method: str) -> str:
+        """
+        Name of quantized TorchScript model: name of the model with quantization method suffix.
+        """
+        base_name = model_name.rsplit(".", 1)[0] if model_name.endswith(".pt") else model_name
+        return f"{base_name}_int8_{method}.ts"
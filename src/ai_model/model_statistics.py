@@ -0,0 +1,119 @@
+"""
+ModelStatistics class is responsible for measuring size, computational cost, latency on CPU
+and test accuracy of trained models, so compressed models can be compared with original ones.
+"""
+
+import io
+import time
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.data import DataLoader
+
+
+class ModelStatistics:
+    """
+    Class measures models on CPU with images of given input size and prints comparison
+    of them as a table.
+    """
+
+    def __init__(self, input_size: tuple, latency_iterations: int = 100):
+        self._input_size = input_size
+        self._latency_iterations = latency_iterations
+
+
+    def print_comparison(self, models: dict, test_loader: DataLoader, with_flops: bool = True,
+                         input_sizes: dict = None):
+        """
+        Print size, FLOPs (only for float models), test accuracy and single image latency
+        of models given as dictionary of name: model. Models which take other size of input
+        images than default one are given in input_sizes dictionary of name: input size.
+        """
+        input_sizes = input_sizes or {}
+        header = f"    {'model':<8} {'size [MB]':>10}"
+        if with_flops:
+            header += f" {'MFLOPs':>10}"
+        print(header + f" {'accuracy':>10} {'latency [ms]':>14}")
+
+        for name, model in models.items():
+            input_size = input_sizes.get(name, self._input_size)
+            row = f"    {name:<8} {self.measure_size(model) / 2**20:>10.2f}"
+            if with_flops:
+                row += f" {self.count_flops(model, input_size) / 1e6:>10.1f}"
+            accuracy = self.measure_accuracy(model, test_loader, input_size)
+            latency_ms = 1000 * self.measure_latency(model, input_size)
+            print(row + f" {accuracy:>10.4f} {latency_ms:>14.2f}")
+
+
+    def measure_size(self, model: nn.Module) -> int:
+        """Size of serialized weights of the model in bytes."""
+        buffer = io.BytesIO()
+        torch.save(model.state_dict(), buffer)
+
+        return buffer.getbuffer().nbytes
+
+
+    def count_flops(self, model: nn.Module, input_size: tuple = None) -> int:
+        """
+        Floating point operations of forward pass of single image, counted for convolutional
+        and linear layers (multiply and add are 2 operations).
+        """
+        flops = []
+
+        def count_conv(module, _, output):
+            kernel_operations = (module.in_channels // module.groups
+                                 * module.kernel_size[0] * module.kernel_size[1])
+            flops.append(2 * output.numel() * kernel_operations)
+
+        def count_linear(module, _, output):
+            flops.append(2 * output.numel() * module.in_features)
+
+        handles = []
+        for module in model.modules():
+            if isinstance(module, nn.Conv2d):
+                handles.append(module.register_forward_hook(count_conv))
+            elif isinstance(module, nn.Linear):
+                handles.append(module.register_forward_hook(count_linear))
+        with torch.inference_mode():
+            model(torch.randn(1, 3, *(input_size or self._input_size)))
+        for handle in handles:
+            handle.remove()
+
+        return sum(flops)
+
+
+    def measure_accuracy(self, model: nn.Module, test_loader: DataLoader,
+                         input_size: tuple = None) -> float:
+        """
+        Accuracy of the model on test dataset. Images are resized, if model takes other size
+        of input images than default one.
+        """
+        correct_samples = 0
+        total_samples = 0
+        with torch.inference_mode():
+            for images, labels in test_loader:
+                if input_size is not None and tuple(images.shape[2:]) != tuple(input_size):
+                    images = F.interpolate(images, size=input_size, mode="bilinear",
+                                           align_corners=False)
+                outputs = model(images)
+                correct_samples += (outputs.argmax(1) == labels).sum().item()
+                total_samples += labels.size(0)
+
+        return correct_samples / total_samples
+
+
+    def measure_latency(self, model: nn.Module, input_size: tuple = None) -> float:
+        """
+        Median latency of forward pass of single image in seconds.
+        """
+        image = torch.randn(1, 3, *(input_size or self._input_size))
+        latencies_s = []
+        with torch.inference_mode():
+            for _ in range(10):
+                model(image)
+            for _ in range(self._latency_iterations):
+                start_s = time.perf_counter()
+                model(image)
+                latencies_s.append(time.perf_counter() - start_s)
+
+        return sorted(latencies_s)[len(latencies_s) // 2]
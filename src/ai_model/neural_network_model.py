@@ -9,31 +9,32 @@ import torch.nn as nn
 class NeuralNetworkModel(nn.Module):
     """
     Class is representing architecture of neural network used for
-    training and steering robotic car.
+    training and steering robotic car. Widths are amounts of channels of convolutional
+    blocks and hidden_units is size of hidden fully connected layer.
     """
-    def __init__(self, classes_amount):
+    def __init__(self, classes_amount, widths=(64, 128, 256), hidden_units=1024):
         super(NeuralNetworkModel, self).__init__()
         self.conv_block1 = nn.Sequential(
-            nn.Conv2d(3, 64, kernel_size=3, stride=1, padding=1),
+            nn.Conv2d(3, widths[0], kernel_size=3, stride=1, padding=1),
             nn.ReLU(inplace=True),
             nn.MaxPool2d(kernel_size=2, stride=2)
         )
         self.conv_block2 = nn.Sequential(
-            nn.Conv2d(64, 128, kernel_size=3, stride=1, padding=1),
+            nn.Conv2d(widths[0], widths[1], kernel_size=3, stride=1, padding=1),
             nn.ReLU(inplace=True),
             nn.MaxPool2d(kernel_size=2, stride=2)
         )
         self.conv_block3 = nn.Sequential(
-            nn.Conv2d(128, 256, kernel_size=3, stride=1, padding=1),
+            nn.Conv2d(widths[1], widths[2], kernel_size=3, stride=1, padding=1),
             nn.ReLU(inplace=True),
             nn.MaxPool2d(kernel_size=2, stride=2)
         )
 
         self.avgpool = nn.AdaptiveAvgPool2d((7, 7))
         self.classifier = nn.Sequential(
-            nn.Linear(256 * 7 * 7, 1024),
+            nn.Linear(widths[2] * 7 * 7, hidden_units),
             nn.ReLU(inplace=True),
-            nn.Linear(1024, classes_amount),
+            nn.Linear(hidden_units, classes_amount),
         )
 
     def forward(self, x):
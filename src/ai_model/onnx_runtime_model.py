@@ -0,0 +1,56 @@
+"""
+OnnxRuntimeModel class is responsible for executing exported ONNX model with ONNX Runtime.
+"""
+
+import os
+import torch
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+
+class OnnxRuntimeModel:
+    """
+    Class runs ONNX model on CPU with all graph optimizations (constant folding, node fusions
+    and layout optimizations) enabled. It is called like torch module: takes batch of images
+    as tensor and returns output of the model as tensor.
+    onnxruntime module is optional dependency, required only to run .onnx models.
+    """
+
+    def __init__(self, path: str):
+        if onnxruntime is None:
+            raise ImportError("onnxruntime module is required to run .onnx models")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = torch.get_num_threads()
+        self._session = onnxruntime.InferenceSession(
+            path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self._session.get_inputs()[0].name
+
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        outputs = self._session.run(None, {self._input_name: batch.cpu().numpy()})
+        return torch.from_numpy(outputs[0])
+
+
+    def get_input_size(self) -> tuple:
+        """Size of input images (height, width) of the model getter."""
+        return tuple(self._session.get_inputs()[0].shape[2:])
+
+
+    def get_metadata_properties(self) -> dict:
+        """Metadata properties (string keys and values) of the model getter."""
+        return self._session.get_modelmeta().custom_metadata_map
+
+
+    def eval(self):
+        """ONNX model is always in inference mode."""
+        return self
@@ -0,0 +1,247 @@
+"""
+AsyncCommunicator class is asyncio based variant of Communicator, which allows steering
+commands and photo requests to be in flight at the same time.
+"""
+
+import time
+import asyncio
+import aiohttp
+
+from communicator import Communicator
+from frame import Frame
+from steering_command import SteeringCommand
+from command_scheduler import AsyncCommandScheduler
+
+
+class AsyncCommunicator(Communicator):
+    """
+    Class is responsible for asynchronous communication between computer and robotic car.
+    It is done via HTTP requests sent with aiohttp over pool of keep-alive connections.
+    Session has to be opened with open() inside running event loop before first request.
+    Photos are always requested one by one: camera stream and synchronous saving of photos
+    aren't supported.
+    """
+
+    def __init__(self, ipv4: str = None):
+        Communicator.__init__(self, ipv4)
+        self._client_session = None
+
+
+    def _create_http_session(self):
+        """HTTP session of aiohttp has to be created inside running event loop in open()."""
+        self._http_session = None
+
+
+    def _create_command_scheduler(self):
+        self._command_scheduler = AsyncCommandScheduler(
+            self._send_turn_request,
+            self._servo_spacing_s
+        )
+
+
+    async def open(self):
+        """Open aiohttp session with pool of keep-alive connections to robotic car."""
+        connector = aiohttp.TCPConnector(limit=self._pool_size)
+        timeout = aiohttp.ClientTimeout(total=self._request_timeout)
+        self._client_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._command_scheduler.start()
+
+
+    async def close(self):
+        """Send pending servo command and close all pooled connections to robotic car."""
+        if self._client_session is not None:
+            await self._command_scheduler.shutdown()
+            await self._client_session.close()
+            self._client_session = None
+
+
+    def start_stream(self):
+        """Camera stream isn't supported by asynchronous communicator."""
+        raise NotImplementedError("Camera stream isn't supported by AsyncCommunicator")
+
+
+    def stop_stream(self):
+        """Camera stream isn't supported by asynchronous communicator."""
+        raise NotImplementedError("Camera stream isn't supported by AsyncCommunicator")
+
+
+    def take_photo_and_save(self, subdirectory_to_store: str = ""):
+        """Synchronous saving of photo isn't supported by asynchronous communicator."""
+        raise NotImplementedError("take_photo_and_save isn't supported by AsyncCommunicator")
+
+
+    async def send_request(self, command: SteeringCommand):
+        """
+        Interface of possible steering commands that change robotic car movement.
+        """
+        self._last_command = command
+        match command:
+            case SteeringCommand.START:
+                await self.start_drive()
+            case SteeringCommand.STOP:
+                await self.stop_drive()
+            case SteeringCommand.FORWARD:
+                await self.forward_drive()
+            case SteeringCommand.BACK:
+                await self.back_drive()
+            case SteeringCommand.RIGHT:
+                await self.turn(command)
+            case SteeringCommand.SLIGHT_RIGHT:
+                await self.turn(command)
+            case SteeringCommand.LEFT:
+                await self.turn(command)
+            case SteeringCommand.SLIGHT_LEFT:
+                await self.turn(command)
+            case SteeringCommand.CENTER_WHEELS:
+                await self.center_wheels()
+            case _:
+                print("Unknown request type")
+
+
+    async def start_drive(self):
+        """Handle starting robotic car drive: center wheels and drive straight concurrently."""
+        await asyncio.gather(self.center_wheels(), self.drive(self._standard_forward))
+
+
+    async def stop_drive(self):
+        """Handle stopping robotic car drive: stop and center wheels concurrently."""
+        await asyncio.gather(self.stop(), self.center_wheels())
+
+
+    async def forward_drive(self):
+        """Handle forward drive: center wheels and drive straight concurrently if needed."""
+        await asyncio.gather(self.center_wheels(), self.drive(self._standard_forward))
+
+
+    async def back_drive(self):
+        """Handle back drive: start driving back if not done yet."""
+        await self.drive(self._standard_backward)
+
+
+    async def drive(self, speed_parameter: int):
+        """
+        Method responsible for sending GET request with speed parameter for
+        driving forward or backward. Request is skipped if car already drives with given speed.
+        """
+        if speed_parameter < self._max_forward and speed_parameter > self._max_backward:
+            if self._actuator_state.update_speed(speed_parameter):
+                url_to_send = f"{self._drive_url}{speed_parameter}"
+                await self._send_speed_request(url_to_send)
+
+
+    async def stop(self):
+        """
+        Method responsible for sending GET request for stop the robotic car.
+        Request is skipped if car is already stopped.
+        """
+        if self._actuator_state.update_speed(self._stop):
+            url_to_send = f"{self._drive_url}{self._stop}"
+            await self._send_speed_request(url_to_send)
+
+
+    async def turn(self, command: SteeringCommand):
+        """
+        Method responsible for scheduling GET request with turn type parameter.
+        Request is sent by command scheduler and may be replaced by newer servo command
+        if it wasn't sent yet. Request is skipped if wheels are already turned that way.
+        """
+        turn_parameter = self._map_turn_car_command(command)
+        turn_parameter = self._turn_parameter_mapper(turn_parameter)
+        if self._actuator_state.update_turn(turn_parameter):
+            url_to_send = f"{self._turn_url}{turn_parameter}"
+            self._command_scheduler.schedule(url_to_send)
+
+
+    async def center_wheels(self):
+        """
+        Method responsible for scheduling GET request for straighten the robotic car wheels.
+        Request is skipped if wheels are already centered.
+        """
+        turn_parameter = self._turn_parameter_mapper(self._center)
+        if self._actuator_state.update_turn(turn_parameter):
+            url_to_send = f"{self._turn_url}{turn_parameter}"
+            self._command_scheduler.schedule(url_to_send)
+
+
+    async def _send_speed_request(self, url_to_send: str):
+        if not await self._send_get_request(url_to_send):
+            self._actuator_state.invalidate_speed()
+
+
+    async def _send_turn_request(self, url_to_send: str):
+        if not await self._send_get_request(url_to_send):
+            self._actuator_state.invalidate_turn()
+
+
+    async def _send_get_request(self, url_to_send: str) -> bool:
+        """
+        Send GET request to robotic car. Returns False when request failed, so state of
+        actuators is unknown.
+        """
+        self._actuator_state.register_sent_command()
+        for attempt in range(self._retries + 1):
+            try:
+                with self._profiler.measure("command request"):
+                    async with self._client_session.get(url_to_send) as response:
+                        await response.read()
+                return True
+            except asyncio.TimeoutError:
+                print(f"TIMEOUT when sending {url_to_send} request")
+                return False
+            except aiohttp.ClientConnectionError:
+                if attempt == self._retries:
+                    print(f"CONNECTION ERROR when sending {url_to_send} request")
+                    return False
+                await asyncio.sleep(self._backoff_factor * (2 ** attempt))
+
+        return False
+
+
+    async def take_photo(self) -> bytes:
+        """
+        Method responsible for taking a picture with robotic car's camera.
+        Method returns .jpg file stored in bytes. If recording is enabled, photo is also
+        saved on a disk.
+        """
+        content, _ = await self._request_photo()
+        return content
+
+
+    async def fetch_frame(self) -> Frame:
+        """
+        Method responsible for taking a picture with robotic car's camera.
+        Method returns frame with .jpg file as content, or None if photo wasn't received.
+        """
+        content, captured_at = await self._request_photo()
+        if content is None:
+            return None
+
+        return Frame(memoryview(content), captured_at)
+
+
+    async def _request_photo(self) -> (bytes, float):
+        content = None
+        captured_at = None
+        try:
+            async with self._client_session.get(self._photo_url) as response:
+                if response.status != 200:
+                    print(f"Photo not available, status code: {response.status}")
+                    return (None, None)
+                # Photo is taken by the car when request arrives, so receiving response
+                # headers is the closest known moment to capture time (as in Communicator).
+                captured_at = time.monotonic()
+                read_start = time.perf_counter()
+                content = await response.read()
+                # Only reading of the photo is measured, as other coroutines (e.g. blocking
+                # classification) may run while this one waits for response headers.
+                self._profiler.record("photo fetch", read_start,
+                                      time.perf_counter() - read_start)
+        except asyncio.TimeoutError:
+            print("TIMEOUT during taking picture!")
+        except aiohttp.ClientError:
+            print("ERROR during taking picture!")
+
+        if content is not None and self._recording_subdirectory is not None:
+            self.save_frame(memoryview(content), self._recording_subdirectory)
+
+        return (content, captured_at)
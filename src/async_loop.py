@@ -0,0 +1,72 @@
+"""
+AsyncLoop class is responsible for running robotic car control loop on asyncio event loop,
+so steering commands and next photo request are in flight at the same time.
+"""
+
+import asyncio
+import threading
+
+from async_communicator import AsyncCommunicator
+from ai_model.model_handler import ModelHandler
+from steering_command import SteeringCommand
+from frame_statistics import FrameStatistics
+
+
+class AsyncLoop:
+    """
+    Class runs control loop in a single thread. While current photo is classified and
+    steering commands based on it are sent, request for the next photo is already in flight.
+    """
+
+    def __init__(self, communicator: AsyncCommunicator, model_handler: ModelHandler,
+                 select_commands, on_commands_sent, exit_flag: threading.Event,
+                 frame_statistics: FrameStatistics):
+        self._communicator = communicator
+        self._model_handler = model_handler
+        self._select_commands = select_commands
+        self._on_commands_sent = on_commands_sent
+        self._exit_flag = exit_flag
+        self._frame_statistics = frame_statistics
+
+
+    def run(self):
+        """
+        Run control loop until exit flag is set.
+        """
+        asyncio.run(self._run())
+
+
+    async def _run(self):
+        await self._communicator.open()
+        await self._communicator.send_request(SteeringCommand.START)
+
+        photo_task = asyncio.create_task(self._communicator.fetch_frame())
+        commands_task = None
+        while not self._exit_flag.is_set():
+            frame = await photo_task
+            photo_task = asyncio.create_task(self._communicator.fetch_frame())
+            # Let the next photo request be sent before classification blocks the event loop.
+            await asyncio.sleep(0)
+
+            if frame is None:
+                print("No response")
+                continue
+
+            probabilities = self._model_handler.predict_frame(frame)
+            self._frame_statistics.record(frame)
+            if commands_task is not None:
+                await commands_task
+            commands_task = asyncio.create_task(self._send_commands(probabilities, frame))
+
+        await photo_task
+        if commands_task is not None:
+            await commands_task
+        await self._communicator.send_request(SteeringCommand.STOP)
+        await self._communicator.close()
+        self._communicator.print_commands_statistics()
+
+
+    async def _send_commands(self, probabilities, frame):
+        for command in self._select_commands(probabilities):
+            await self._communicator.send_request(command)
+        self._on_commands_sent(frame)
@@ -0,0 +1,123 @@
+"""
+Benchmark of robotic car control loop. Session is run end to end against simulated car server,
+which serves recorded photos with configurable latency and jitter, and throughput of the loop
+is reported.
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+MAIN_WORKSPACE = str(Path(__file__).parent.parent)
+sys.path.append(MAIN_WORKSPACE)
+
+from session import Session
+from commandline_args_parser import CommandLineArgsParser
+from simulated_car_server import SimulatedCarServer
+
+
+class ControlLoopBenchmark:
+    """
+    Class runs Session in 'run' mode against simulated car server and reports decisions per
+    second, end-to-end decision latency percentiles and amount of commands sent to the car.
+    """
+
+    def __init__(self, benchmark_args: argparse.Namespace):
+        self._args = benchmark_args
+        self._server = SimulatedCarServer(
+            photos_directory=os.path.abspath(benchmark_args.photos),
+            stream_fps=benchmark_args.fps,
+            latency_s=benchmark_args.latency,
+            jitter_s=benchmark_args.jitter
+        )
+
+
+    def run(self) -> dict:
+        """Run the benchmark and return its results."""
+        self._server.start()
+        try:
+            session = Session(self._create_session_args(), self._server.get_address())
+            session.start_session()
+        finally:
+            self._server.stop()
+
+        return self._collect_results(session)
+
+
+    def _create_session_args(self) -> CommandLineArgsParser:
+        return CommandLineArgsParser([
+            "--mode", "run",
+            "--time", str(self._args.time),
+            "--model", self._args.model,
+            "--loop", self._args.loop,
+            "--camera", self._args.camera,
+            "--profile", "on",
+        ])
+
+
+    def _collect_results(self, session: Session) -> dict:
+        decisions_amount = session.get_frame_statistics().get_frames_amount()
+        latency_s = session.get_profiler().get_percentiles("decision latency")
+        results = {
+            "loop": self._args.loop,
+            "camera": self._args.camera,
+            "latency_s": self._args.latency,
+            "jitter_s": self._args.jitter,
+            "time_s": self._args.time,
+            "decisions": decisions_amount,
+            "decisions_per_second": decisions_amount / self._args.time,
+            "decision_latency_ms": {
+                f"p{percentile}": 1000 * value for percentile, value in latency_s.items()
+            },
+            "photos_served": self._server.get_photos_served_amount(),
+            "speed_commands_received": self._server.get_speed_commands_amount(),
+            "turn_commands_received": self._server.get_turn_commands_amount(),
+        }
+
+        return results
+
+
+def print_results(results: dict):
+    """Print benchmark results on console."""
+    print("Control loop benchmark results:")
+    print(f"    Loop: {results['loop']}, camera: {results['camera']}")
+    print(f"    Simulated latency: {1000 * results['latency_s']:.1f} ms "
+          f"+/- {1000 * results['jitter_s']:.1f} ms")
+    print(f"    Decisions per second: {results['decisions_per_second']:.2f}")
+    for percentile, value in results["decision_latency_ms"].items():
+        print(f"    Decision latency {percentile}: {value:.1f} ms")
+    print(f"    Photos served: {results['photos_served']}")
+    print(f"    Speed commands received: {results['speed_commands_received']}")
+    print(f"    Turn commands received: {results['turn_commands_received']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of robotic car control loop")
+    parser.add_argument("--model", type=str, required=True,
+                        help="Name of trained model stored in trained_models directory")
+    parser.add_argument("--photos", type=str, default=MAIN_WORKSPACE + "/../dataset/test",
+                        help="Directory with recorded .jpg photos served by simulated car")
+    parser.add_argument("--time", type=int, default=20, help="Time of drive in seconds")
+    parser.add_argument("--loop", type=str, default="serial",
+                        help="Control loop type: 'serial', 'pipelined' or 'async'")
+    parser.add_argument("--camera", type=str, default="photo",
+                        help="Camera mode: 'photo' or 'stream'")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Simulated delay of each request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005,
+                        help="Simulated jitter of each request in seconds")
+    parser.add_argument("--fps", type=float, default=20.0,
+                        help="Frame rate of simulated MJPEG stream")
+    parser.add_argument("--output", type=str, required=False,
+                        help="Optional .json file to save results in")
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    benchmark_results = ControlLoopBenchmark(args).run()
+    print_results(benchmark_results)
+    if output_path:
+        with open(file=output_path, mode="w", encoding="utf-8") as file:
+            json.dump(benchmark_results, file, indent=2)
+        print(f"Results saved in {output_path}")
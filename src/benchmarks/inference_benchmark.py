@@ -0,0 +1,212 @@
+"""
+Micro-benchmark of NeuralNetworkModel inference on CPU. Forward pass latency and throughput
+are measured for batch sizes, thread counts, input resolutions and execution backends.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import platform
+import argparse
+from pathlib import Path
+
+import torch
+
+MAIN_WORKSPACE = str(Path(__file__).parent.parent)
+sys.path.append(MAIN_WORKSPACE)
+
+from ai_model.architecture_registry import ArchitectureRegistry
+
+
+class InferenceBenchmark:
+    """
+    Class measures forward pass of the model with every combination of backend, thread count,
+    input resolution and batch size. Supported backends are:
+        eager - plain module under torch.no_grad(),
+        inference_mode - plain module under torch.inference_mode(),
+        channels_last - module and input in channels last memory format,
+        torchscript - traced and frozen TorchScript module,
+        compile - module compiled with torch.compile.
+    """
+
+    BACKENDS = ("eager", "inference_mode", "channels_last", "torchscript", "compile")
+
+    def __init__(self, model: torch.nn.Module, warmup_iterations: int = 10,
+                 iterations: int = 50):
+        self._model = model.cpu().eval()
+        self._warmup_iterations = warmup_iterations
+        self._iterations = iterations
+
+
+    def run(self, backends: list, batch_sizes: list, threads: list, resolutions: list) -> list:
+        """
+        Run the benchmark for every combination of parameters and return list of results.
+        Backend which can not be run in this environment is reported and skipped.
+        """
+        results = []
+        for threads_amount in threads:
+            torch.set_num_threads(threads_amount)
+            for resolution in resolutions:
+                for backend in backends:
+                    try:
+                        forward = self._prepare_backend(backend, resolution)
+                        for batch_size in batch_sizes:
+                            result = self._measure(forward, backend, batch_size, resolution)
+                            result["threads"] = threads_amount
+                            results.append(result)
+                            print_result(result)
+                    except (RuntimeError, NotImplementedError, AttributeError) as ex:
+                        print(f"Backend {backend} skipped: {ex}")
+
+        return results
+
+
+    def _prepare_backend(self, backend: str, resolution: int):
+        """
+        Return function executing forward pass of given backend on input batch.
+        """
+        model = self._model
+        match backend:
+            case "eager":
+                def forward(batch):
+                    with torch.no_grad():
+                        return model(batch)
+            case "inference_mode":
+                def forward(batch):
+                    with torch.inference_mode():
+                        return model(batch)
+            case "channels_last":
+                model = self._copy_model().to(memory_format=torch.channels_last)
+                def forward(batch):
+                    with torch.inference_mode():
+                        return model(batch.contiguous(memory_format=torch.channels_last))
+            case "torchscript":
+                example = torch.randn(1, 3, resolution, resolution)
+                with torch.no_grad():
+                    model = torch.jit.freeze(torch.jit.trace(self._copy_model(), example))
+                def forward(batch):
+                    with torch.no_grad():
+                        return model(batch)
+            case "compile":
+                model = torch.compile(self._copy_model())
+                def forward(batch):
+                    with torch.no_grad():
+                        return model(batch)
+            case _:
+                raise ValueError(f"Unknown backend: {backend}")
+
+        return forward
+
+
+    def _copy_model(self) -> torch.nn.Module:
+        return copy.deepcopy(self._model).eval()
+
+
+    def _measure(self, forward, backend: str, batch_size: int, resolution: int) -> dict:
+        batch = torch.randn(batch_size, 3, resolution, resolution)
+        for _ in range(self._warmup_iterations):
+            forward(batch)
+
+        latencies_s = []
+        for _ in range(self._iterations):
+            start_s = time.perf_counter()
+            forward(batch)
+            latencies_s.append(time.perf_counter() - start_s)
+        latencies_s.sort()
+
+        mean_s = sum(latencies_s) / len(latencies_s)
+        result = {
+            "backend": backend,
+            "batch_size": batch_size,
+            "resolution": resolution,
+            "latency_ms": {
+                "mean": 1000 * mean_s,
+                "p50": 1000 * latencies_s[len(latencies_s) // 2],
+                "p95": 1000 * latencies_s[min(len(latencies_s) - 1,
+                                              int(0.95 * len(latencies_s)))],
+                "min": 1000 * latencies_s[0],
+            },
+            "images_per_second": batch_size / mean_s,
+        }
+
+        return result
+
+
+def print_result(result: dict):
+    """Print single benchmark result on console."""
+    print(f"{result['backend']:<15} threads {result['threads']:>2}   "
+          f"resolution {result['resolution']:>4}   batch {result['batch_size']:>3}   "
+          f"p50 {result['latency_ms']['p50']:8.2f} ms   "
+          f"{result['images_per_second']:9.1f} img/s")
+
+
+def load_model(model_name: str, architecture: str, classes_amount: int) -> (torch.nn.Module,
+                                                                            tuple):
+    """
+    Load trained model from trained_models directory or create untrained one of given
+    architecture, if model name is not given. Returns the model and size of its input images.
+    """
+    if model_name is None:
+        model = ArchitectureRegistry.create_model(architecture, {"classes_amount": classes_amount})
+        return (model, ArchitectureRegistry.get_input_size(architecture))
+
+    model_path = os.path.join(MAIN_WORKSPACE, "ai_model", "trained_models", model_name)
+    checkpoint = torch.load(model_path, map_location="cpu", weights_only=False)
+    if isinstance(checkpoint, dict):
+        model = ArchitectureRegistry.create_model_from_checkpoint(checkpoint)
+        return (model, tuple(checkpoint["input_size"]))
+
+    return (checkpoint, ArchitectureRegistry.get_input_size(architecture))
+
+
+def parse_int_list(value: str) -> list:
+    """Parse comma separated list of integers."""
+    return [int(item) for item in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark of NeuralNetworkModel inference")
+    parser.add_argument("--model", type=str, required=False,
+                        help="Name of trained model stored in trained_models directory. "
+                             "Untrained model is benchmarked if not given")
+    parser.add_argument("--architecture", type=str,
+                        default=ArchitectureRegistry.DEFAULT_ARCHITECTURE,
+                        help="Architecture of untrained model: "
+                             + ", ".join(ArchitectureRegistry.get_names()))
+    parser.add_argument("--classes", type=int, default=7,
+                        help="Amount of classes of untrained model")
+    parser.add_argument("--backends", type=str, default=",".join(InferenceBenchmark.BACKENDS),
+                        help="Comma separated backends: " + ", ".join(InferenceBenchmark.BACKENDS))
+    parser.add_argument("--batches", type=parse_int_list, default=[1, 2, 4, 8, 16, 32],
+                        help="Comma separated batch sizes")
+    parser.add_argument("--threads", type=parse_int_list, default=[1, 2, 4, os.cpu_count()],
+                        help="Comma separated amounts of intra-op threads")
+    parser.add_argument("--resolutions", type=parse_int_list, required=False,
+                        help="Comma separated input resolutions (square images). "
+                             "Input resolution of the model by default")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up iterations")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured iterations")
+    parser.add_argument("--output", type=str, default="inference_benchmark.json",
+                        help=".json file to save results in")
+    args = parser.parse_args()
+
+    benchmarked_model, input_size = load_model(args.model, args.architecture, args.classes)
+    benchmark = InferenceBenchmark(benchmarked_model, args.warmup, args.iterations)
+    benchmark_results = benchmark.run(args.backends.split(","), args.batches,
+                                      sorted(set(args.threads)),
+                                      args.resolutions or [input_size[0]])
+
+    report = {
+        "torch_version": torch.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "model": args.model,
+        "results": benchmark_results,
+    }
+    output_path = os.path.abspath(args.output)
+    with open(file=output_path, mode="w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved in {output_path}")
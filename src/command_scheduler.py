@@ -0,0 +1,153 @@
+"""
+CommandScheduler and AsyncCommandScheduler classes are responsible for deferred sending of
+servo commands to robotic car, so waiting for servo to settle doesn't block control loop.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class CommandScheduler:
+    """
+    Class is single-slot, cancellable queue of deferred servo commands handled by a worker
+    thread. Consecutive commands are sent at least spacing_s seconds apart. When a command
+    is scheduled while previous one is still pending, the newer command replaces it.
+    """
+
+    def __init__(self, send_command, spacing_s: float):
+        self._send_command = send_command
+        self._spacing_s = spacing_s
+
+        self._pending_command = None
+        self._last_sent_time = time.monotonic() - spacing_s
+        self._replaced_commands_amount = 0
+        self._is_running = True
+        self._condition = threading.Condition()
+
+        self._worker_thread = threading.Thread(target=self._worker, name="command-scheduler",
+                                               daemon=True)
+        self._worker_thread.start()
+
+
+    def schedule(self, *command_args):
+        """
+        Schedule command to be sent as soon as spacing since previous command has passed.
+        Not yet sent command is replaced.
+        """
+        with self._condition:
+            if self._pending_command is not None:
+                self._replaced_commands_amount += 1
+            self._pending_command = command_args
+            self._condition.notify()
+
+
+    def cancel(self):
+        """Drop pending command if it was not sent yet."""
+        with self._condition:
+            self._pending_command = None
+
+
+    def shutdown(self):
+        """Send pending command, if any, and stop the worker thread."""
+        with self._condition:
+            self._is_running = False
+            self._condition.notify()
+        self._worker_thread.join()
+
+
+    def get_replaced_commands_amount(self) -> int:
+        """Amount of commands replaced before being sent getter."""
+        return self._replaced_commands_amount
+
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._is_running and self._pending_command is None:
+                    self._condition.wait()
+                if self._pending_command is None:
+                    return
+
+                wait_s = self._last_sent_time + self._spacing_s - time.monotonic()
+                if wait_s > 0:
+                    self._condition.wait(wait_s)
+                    continue
+
+                command_args = self._pending_command
+                self._pending_command = None
+
+            self._send_command(*command_args)
+            self._last_sent_time = time.monotonic()
+
+
+class AsyncCommandScheduler:
+    """
+    Class is asyncio variant of CommandScheduler. Deferred servo commands are sent by worker
+    task, which has to be started with start() inside running event loop.
+    """
+
+    def __init__(self, send_command, spacing_s: float):
+        self._send_command = send_command
+        self._spacing_s = spacing_s
+
+        self._pending_command = None
+        self._last_sent_time = time.monotonic() - spacing_s
+        self._replaced_commands_amount = 0
+        self._is_running = True
+        self._wakeup = None
+        self._worker_task = None
+
+
+    def start(self):
+        """Start worker task in running event loop."""
+        self._wakeup = asyncio.Event()
+        self._worker_task = asyncio.create_task(self._worker())
+
+
+    def schedule(self, *command_args):
+        """
+        Schedule command to be sent as soon as spacing since previous command has passed.
+        Not yet sent command is replaced.
+        """
+        if self._pending_command is not None:
+            self._replaced_commands_amount += 1
+        self._pending_command = command_args
+        self._wakeup.set()
+
+
+    def cancel(self):
+        """Drop pending command if it was not sent yet."""
+        self._pending_command = None
+
+
+    async def shutdown(self):
+        """Send pending command, if any, and stop the worker task."""
+        self._is_running = False
+        self._wakeup.set()
+        await self._worker_task
+
+
+    def get_replaced_commands_amount(self) -> int:
+        """Amount of commands replaced before being sent getter."""
+        return self._replaced_commands_amount
+
+
+    async def _worker(self):
+        while True:
+            if self._pending_command is None:
+                if not self._is_running:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wait_s = self._last_sent_time + self._spacing_s - time.monotonic()
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+                continue
+
+            command_args = self._pending_command
+            self._pending_command = None
+            await self._send_command(*command_args)
+            self._last_sent_time = time.monotonic()
@@ -3,15 +3,18 @@ CommandLineArgsParser class is responsible for parsing and validating user argum
 command line.
 """
 
+import os
 import sys
 import argparse
 
+from ai_model.architecture_registry import ArchitectureRegistry
+
 
 class CommandLineArgsParser:
     """
     CommandLineArgsParser class is parser and validator for user's arguments from command line.
     """
-    def __init__(self):
+    def __init__(self, args: list = None):
         app_description = self._prepare_app_description()
         self._parser = argparse.ArgumentParser(description=app_description)
 
@@ -22,13 +25,50 @@ class CommandLineArgsParser:
         self._parser.add_argument("--time", type=int, required=False, help=help_descriptions[3])
         self._parser.add_argument("--model", type=str, required=False, help=help_descriptions[4])
         self._parser.add_argument("--music", type=str, required=False, help=help_descriptions[5])
-        self._args = self._parser.parse_args()
+        self._parser.add_argument("--loop", type=str, required=False, default="serial",
+                                  help=help_descriptions[6])
+        self._parser.add_argument("--directory", type=str, required=False,
+                                  help=help_descriptions[7])
+        self._parser.add_argument("--record", type=str, required=False, help=help_descriptions[8])
+        self._parser.add_argument("--camera", type=str, required=False, default="photo",
+                                  help=help_descriptions[9])
+        self._parser.add_argument("--profile", type=str, required=False,
+                                  help=help_descriptions[10])
+        self._parser.add_argument("--trace", type=str, required=False, help=help_descriptions[11])
+        self._parser.add_argument("--export", type=str, required=False, help=help_descriptions[12])
+        self._parser.add_argument("--quantize", type=str, required=False,
+                                  help=help_descriptions[13])
+        self._parser.add_argument("--architecture", type=str, required=False,
+                                  default=ArchitectureRegistry.DEFAULT_ARCHITECTURE,
+                                  help=help_descriptions[14])
+        self._parser.add_argument("--width", type=float, required=False, default=1.0,
+                                  help=help_descriptions[15])
+        self._parser.add_argument("--teacher", type=str, required=False,
+                                  help=help_descriptions[16])
+        self._parser.add_argument("--prune", type=float, required=False,
+                                  help=help_descriptions[17])
+        self._parser.add_argument("--resume", type=str, required=False,
+                                  help=help_descriptions[18])
+        self._parser.add_argument("--patience", type=int, required=False,
+                                  help=help_descriptions[19])
+        self._parser.add_argument("--lr", type=float, required=False, default=0.001,
+                                  help=help_descriptions[20])
+        self._parser.add_argument("--optimizer", type=str, required=False, default="adam",
+                                  help=help_descriptions[21])
+        self._parser.add_argument("--name", type=str, required=False,
+                                  help=help_descriptions[22])
+        self._args = self._parser.parse_args(args)
 
         try:
             self._map_music_arg()
         except argparse.ArgumentTypeError as ex:
             print(ex)
             print("No music will be played")
+        try:
+            self._map_profile_arg()
+        except argparse.ArgumentTypeError as ex:
+            print(ex)
+            print("Control loop won't be profiled")
         self._validate_args()
 
 
@@ -39,21 +79,72 @@ class CommandLineArgsParser:
         return description
 
 
-    def _prepare_help_for_arguments(self) -> (str, str, str, str, str, str):
-        mode_help = """Specify mode of application. Allowed values: 'run', or 'train'.
-        Argument required."""
-        epochs_help = """Specify training epochs amount. Required only when mode is 'train'.
-        Must be positive integer."""
-        batch_help = """Specify batch size. Required only when mode is 'train'.
-        Positive integer required."""
+    def _prepare_help_for_arguments(self) -> (str, str, str, str, str, str, str, str, str,
+                                               str, str, str, str, str, str, str, str, str,
+                                               str, str, str, str, str):
+        mode_help = """Specify mode of application. Allowed values: 'run', 'train', 'evaluate',
+        'export' or 'sweep'. Argument required."""
+        epochs_help = """Specify training epochs amount. Required only when mode is 'train'
+        or 'sweep'. Must be positive integer."""
+        batch_help = """Specify batch size. Required only when mode is 'train'. Optional when
+        mode is 'evaluate' (default 32). Positive integer required."""
         time_help = """Specify time of driving robotic-car in seconds. Positive integer required"""
-        model_help = """Specify name of the trained neural network model for use.
-        It has to be *.pt file. File with trained model should be stored in
-        ./src/ai_model_trained_models/ directory"""
+        model_help = """Specify name of the trained neural network model for use in 'run',
+        'evaluate' or 'export' mode.
+        It has to be *.pt file, or exported *.ts (TorchScript) or *.onnx file. File with trained
+        model should be stored in ./src/ai_model_trained_models/ directory"""
         music_help = """Specify if music should be played when car is started.
         Possible values: 'true'/'on' or 'false'/'off'"""
-
-        return(mode_help, epochs_help, batch_help, time_help, model_help, music_help)
+        loop_help = """Specify type of main control loop used when mode is 'run'.
+        Possible values: 'serial' (default), 'pipelined' or 'async'"""
+        directory_help = """Specify directory with images to classify. Required only when
+        mode is 'evaluate'."""
+        record_help = """Specify dataset subdirectory (e.g. 'recordings/drive_1') where every photo
+        taken during drive is saved. Optional, only when mode is 'run'."""
+        camera_help = """Specify how photos are received from robotic car when mode is 'run'.
+        Possible values: 'photo' (default) - separate request for each photo, or 'stream' -
+        continuous MJPEG stream, of which always the newest frame is used. 'stream' can't be
+        used with 'async' loop."""
+        profile_help = """Specify if durations of control loop stages should be measured and
+        their percentiles printed when drive finishes. Possible values: 'true'/'on' or
+        'false'/'off'"""
+        trace_help = """Specify path of .json file in which every measured stage is saved
+        in Chrome trace format. Optional, used only when profiling is on."""
+        export_help = """Specify format in which model is exported for optimized inference.
+        Possible values: 'torchscript' or 'onnx'. Required when mode is 'export', optional when
+        mode is 'train' (trained model is exported after saving)."""
+        quantize_help = """Specify post-training int8 quantization of trained model. Optional,
+        only when mode is 'train'. Possible values: 'dynamic' (Linear layers) or 'static' (all
+        layers, calibrated on test dataset). Quantized model is saved as *.ts file."""
+
+        architecture_help = f"""Specify architecture of trained neural network model. Optional,
+        only when mode is 'train'. Possible values: {', '.join(ArchitectureRegistry.get_names())}
+        (default '{ArchitectureRegistry.DEFAULT_ARCHITECTURE}'). In other modes architecture
+        is read from the model file."""
+        width_help = """Specify multiplier of amounts of channels and hidden units of trained
+        architecture. Optional, only when mode is 'train'. Positive number (default 1.0)."""
+        teacher_help = """Specify name of trained *.pt model from ./src/ai_model/trained_models/
+        directory, which is distilled into trained model. Optional, only when mode is 'train'."""
+        prune_help = """Specify ratio of channels and hidden units removed from teacher model.
+        Pruned teacher is fine-tuned by distillation instead of training new model. Optional,
+        only when mode is 'train' and teacher is specified. Number between 0 and 1."""
+        resume_help = """Specify name of interrupted training from
+        ./src/ai_model/trained_models/checkpoints/ directory, which is continued from its last
+        checkpoint. Optional, only when mode is 'train'. Architecture is read from checkpoint."""
+        patience_help = """Specify amount of epochs without improvement of test loss, after which
+        training stops early. Optional, only when mode is 'train'. Positive integer required."""
+        lr_help = """Specify learning rate of optimizer. Optional, only when mode is 'train'
+        or 'sweep'. Positive number (default 0.001)."""
+        optimizer_help = """Specify optimizer used for training. Optional, only when mode is
+        'train' or 'sweep'. Possible values: 'adam' (default), 'adamw' or 'sgd' (with momentum)."""
+        name_help = """Specify name of trained model and its training checkpoints directory.
+        Optional, only when mode is 'train'. By default name is created from architecture,
+        epochs, batch size and date."""
+
+        return(mode_help, epochs_help, batch_help, time_help, model_help, music_help, loop_help,
+               directory_help, record_help, camera_help, profile_help, trace_help, export_help,
+               quantize_help, architecture_help, width_help, teacher_help, prune_help,
+               resume_help, patience_help, lr_help, optimizer_help, name_help)
 
 
     def _map_music_arg(self) -> bool:
@@ -67,16 +158,34 @@ class CommandLineArgsParser:
             raise argparse.ArgumentTypeError(exception_str)
 
 
+    def _map_profile_arg(self) -> bool:
+        if not self._args.profile or self._args.profile.lower() in ('false', 'off'):
+            self._args.profile = False
+        elif self._args.profile.lower() in ('true', 'on'):
+            self._args.profile = True
+        else:
+            exception_str = "'true', 'on', 'false' or 'off' argument value expected"
+            self._args.profile = False
+            raise argparse.ArgumentTypeError(exception_str)
+        if self._args.trace:
+            self._args.trace = os.path.abspath(self._args.trace)
+
+
     def _validate_args(self):
         is_error = False
-        if self._args.mode.lower() not in ('run', 'train'):
-            print("Wrong mode param. It has to 'run' or 'train'.")
+        if self._args.mode.lower() not in ('run', 'train', 'evaluate', 'export', 'sweep'):
+            print("Wrong mode param. It has to 'run', 'train', 'evaluate', 'export' or 'sweep'.")
             is_error = is_error or True
         else:
-            if self._args.mode.lower() == 'train':
+            if self._args.mode.lower() in ('train', 'sweep'):
                 is_error = self._validate_train_args()
             if self._args.mode.lower() == 'run':
                 is_error = self._validate_run_args()
+            if self._args.mode.lower() == 'evaluate':
+                is_error = self._validate_evaluate_args()
+            if self._args.mode.lower() == 'export':
+                is_error = self._validate_export_args()
+            is_error = self._validate_architecture() or is_error
 
             if is_error:
                 print("Wrong user's arguments. Shutting down!")
@@ -99,6 +208,42 @@ class CommandLineArgsParser:
             print("Wrong batch size param. It has to be positive integer number.")
             is_error = True
 
+        if self._args.export is not None:
+            is_error = self._validate_export_format() or is_error
+
+        if self._args.width <= 0:
+            print("Wrong width param. It has to be positive number.")
+            is_error = True
+
+        if self._args.prune is not None:
+            if not self._args.teacher:
+                print("No teacher param. Specify trained model to prune.")
+                is_error = True
+            if not 0 < self._args.prune < 1:
+                print("Wrong prune param. It has to be number between 0 and 1.")
+                is_error = True
+
+        if self._args.patience is not None and self._args.patience <= 0:
+            print("Wrong patience param. It has to be positive integer number.")
+            is_error = True
+
+        if self._args.lr <= 0:
+            print("Wrong lr param. It has to be positive number.")
+            is_error = True
+
+        if self._args.optimizer.lower() not in ('adam', 'adamw', 'sgd'):
+            print("Wrong optimizer param. It has to be 'adam', 'adamw' or 'sgd'.")
+            is_error = True
+        else:
+            self._args.optimizer = self._args.optimizer.lower()
+
+        if self._args.quantize is not None:
+            if self._args.quantize.lower() not in ('dynamic', 'static'):
+                print("Wrong quantize param. It has to be 'dynamic' or 'static'.")
+                is_error = True
+            else:
+                self._args.quantize = self._args.quantize.lower()
+
         return is_error
 
 
@@ -115,8 +260,78 @@ class CommandLineArgsParser:
             print("No model file name param. Specify trained model.")
             is_error = True
 
+        if self._args.loop.lower() not in ('serial', 'pipelined', 'async'):
+            print("Wrong loop param. It has to be 'serial', 'pipelined' or 'async'.")
+            is_error = True
+        else:
+            self._args.loop = self._args.loop.lower()
+
+        if self._args.camera.lower() not in ('photo', 'stream'):
+            print("Wrong camera param. It has to be 'photo' or 'stream'.")
+            is_error = True
+        elif self._args.camera.lower() == 'stream' and self._args.loop == 'async':
+            print("Camera 'stream' can't be used with 'async' loop.")
+            is_error = True
+        else:
+            self._args.camera = self._args.camera.lower()
+
+        return is_error
+
+    def _validate_evaluate_args(self) -> bool:
+        is_error = False
+        if not self._args.model or self._args.model == "":
+            print("No model file name param. Specify trained model.")
+            is_error = True
+
+        if not self._args.directory or not os.path.isdir(self._args.directory):
+            print("Wrong directory param. Specify existing directory with images to classify.")
+            is_error = True
+        else:
+            self._args.directory = os.path.abspath(self._args.directory)
+
+        if self._args.batch is not None and self._args.batch <= 0:
+            print("Wrong batch size param. It has to be positive integer number.")
+            is_error = True
+
+        return is_error
+
+
+    def _validate_export_args(self) -> bool:
+        is_error = False
+        if not self._args.model or self._args.model == "":
+            print("No model file name param. Specify trained model.")
+            is_error = True
+        elif not self._args.model.endswith(".pt"):
+            print("Wrong model param. Only *.pt model can be exported.")
+            is_error = True
+
+        if not self._args.export:
+            print("No export param. Specify 'torchscript' or 'onnx'.")
+            is_error = True
+        else:
+            is_error = self._validate_export_format() or is_error
+
         return is_error
 
+
+    def _validate_architecture(self) -> bool:
+        if self._args.architecture.lower() not in ArchitectureRegistry.get_names():
+            print("Wrong architecture param. It has to be one of: "
+                  f"{', '.join(ArchitectureRegistry.get_names())}.")
+            return True
+
+        self._args.architecture = self._args.architecture.lower()
+        return False
+
+
+    def _validate_export_format(self) -> bool:
+        if self._args.export.lower() not in ('torchscript', 'onnx'):
+            print("Wrong export param. It has to be 'torchscript' or 'onnx'.")
+            return True
+
+        self._args.export = self._args.export.lower()
+        return False
+
     def get_mode(self):
         """
         Mode getter.
@@ -158,6 +373,125 @@ class CommandLineArgsParser:
         return self._args.music
 
 
+    def get_loop(self):
+        """
+        Main control loop type getter.
+        """
+        return self._args.loop
+
+
+    def get_directory(self):
+        """
+        Directory with images to classify getter.
+        """
+        return self._args.directory
+
+
+    def get_record(self):
+        """
+        Dataset subdirectory for recording photos getter.
+        """
+        return self._args.record
+
+
+    def get_camera(self):
+        """
+        Camera mode getter.
+        """
+        return self._args.camera
+
+
+    def get_profile(self):
+        """
+        Profiling getter.
+        """
+        return self._args.profile
+
+
+    def get_trace(self):
+        """
+        Trace file path getter.
+        """
+        return self._args.trace
+
+
+    def get_export(self):
+        """
+        Export format getter.
+        """
+        return self._args.export
+
+
+    def get_quantize(self):
+        """
+        Quantization method getter.
+        """
+        return self._args.quantize
+
+
+    def get_architecture(self):
+        """
+        Architecture of trained model getter.
+        """
+        return self._args.architecture
+
+
+    def get_width(self):
+        """
+        Width multiplier getter.
+        """
+        return self._args.width
+
+
+    def get_teacher(self):
+        """
+        Teacher model getter.
+        """
+        return self._args.teacher
+
+
+    def get_prune(self):
+        """
+        Pruning ratio getter.
+        """
+        return self._args.prune
+
+
+    def get_resume(self):
+        """
+        Name of resumed training getter.
+        """
+        return self._args.resume
+
+
+    def get_patience(self):
+        """
+        Early stopping patience getter.
+        """
+        return self._args.patience
+
+
+    def get_lr(self):
+        """
+        Learning rate getter.
+        """
+        return self._args.lr
+
+
+    def get_optimizer(self):
+        """
+        Optimizer name getter.
+        """
+        return self._args.optimizer
+
+
+    def get_name(self):
+        """
+        Name of trained model getter.
+        """
+        return self._args.name
+
+
     def print_args(self):
         """
         Print command line arguments on console.
@@ -167,10 +501,41 @@ class CommandLineArgsParser:
             print(f"Time: {self._args.time}")
             print(f"Model: {self._args.model}")
             print(f"If music: {self._args.music}")
+            print(f"Loop: {self._args.loop}")
+            print(f"Record: {self._args.record}")
+            print(f"Camera: {self._args.camera}")
+            print(f"Profile: {self._args.profile}")
         if self._args.mode == "train":
             print(f"App mode: {self._args.mode}")
             print(f"Epochs: {self._args.epochs}")
             print(f"Batch size: {self._args.batch}")
+            print(f"Architecture: {self._args.architecture}")
+            print(f"Width: {self._args.width}")
+            print(f"Learning rate: {self._args.lr}")
+            print(f"Optimizer: {self._args.optimizer}")
+            print(f"Name: {self._args.name}")
+            print(f"Teacher: {self._args.teacher}")
+            print(f"Prune: {self._args.prune}")
+            print(f"Resume: {self._args.resume}")
+            print(f"Patience: {self._args.patience}")
+            print(f"Export: {self._args.export}")
+            print(f"Quantize: {self._args.quantize}")
+        if self._args.mode == "evaluate":
+            print(f"App mode: {self._args.mode}")
+            print(f"Model: {self._args.model}")
+            print(f"Directory: {self._args.directory}")
+            print(f"Batch size: {self._args.batch}")
+        if self._args.mode == "export":
+            print(f"App mode: {self._args.mode}")
+            print(f"Model: {self._args.model}")
+            print(f"Export: {self._args.export}")
+        if self._args.mode == "sweep":
+            print(f"App mode: {self._args.mode}")
+            print(f"Epochs: {self._args.epochs}")
+            print(f"Batch size: {self._args.batch}")
+            print(f"Architecture: {self._args.architecture}")
+            print(f"Learning rate: {self._args.lr}")
+            print(f"Optimizer: {self._args.optimizer}")
 
 
 if __name__ == "__main__":
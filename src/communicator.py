@@ -3,38 +3,58 @@ Communicator class is responsible for communication between computer and robotic
 """
 
 import os
-import shutil
 import time
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from settings_readers.network_settings_reader import NetworkSettingsReader
 from settings_readers.requests_settings_reader import RequestsSettingsReader
 from settings_readers.drive_settings_reader import DriveSettingsReader
 from steering_command import SteeringCommand
+from command_scheduler import CommandScheduler
+from actuator_state import ActuatorState
+from frame_reader import FrameReader
+from frame import Frame
+from mjpeg_stream_reader import MjpegStreamReader
+from latency_profiler import LatencyProfiler
+from dataset_manifest import DatasetManifest
 from date_to_str import DateToStr, DateNameType
 
 
 class Communicator:
     """
     Class is responsible for communication between computer and robotic car.
-    It is done via HTTP requests.
+    It is done via HTTP requests. Address of the car is read from network settings,
+    unless ipv4 is given (e.g. address of simulated car server).
     """
 
-    def __init__(self):
+    def __init__(self, ipv4: str = None):
         self._import_from_network_settings()
+        if ipv4 is not None:
+            self._ipv4 = ipv4
         self._import_from_drive_settings()
         self._import_from_requests_settings()
         self._set_url_bases()
+        self._create_http_session()
 
         self._last_command = None
-        self._is_wheels_centered = True
-        self._is_driving_forward = False
-        self._is_driving_backward = False
+        self._actuator_state = ActuatorState()
 
         self._offset = 8
-        self._turn_sleep_s = 0.15
+        self._servo_spacing_s = 0.15
+        self._create_command_scheduler()
 
         self._path_to_dataset = "../../dataset/"
+        self._dataset_manifest = DatasetManifest(self._path_to_dataset)
+
+        # Enough buffers for frame being read, waiting for inference and being classified.
+        self._frame_reader = FrameReader(buffers_amount=4)
+        self._recording_subdirectory = None
+        self._saved_frames_amount = 0
+        self._stream_reader = None
+        self._profiler = LatencyProfiler()
 
 
     def _import_from_network_settings(self):
@@ -62,6 +82,10 @@ class Communicator:
         requests_settings_reader = RequestsSettingsReader()
         requests_settings_reader.read()
         self._request_timeout = requests_settings_reader.get_request_timeout()
+        self._pool_size = requests_settings_reader.get_pool_size()
+        self._retries = requests_settings_reader.get_retries()
+        self._backoff_factor = requests_settings_reader.get_backoff_factor()
+        self._stream_path = requests_settings_reader.get_stream_path()
 
 
     def _set_url_bases(self):
@@ -69,6 +93,44 @@ class Communicator:
         self._drive_url = f"{self._url}/drive?speed="
         self._turn_url = f"{self._url}/drive?turn="
         self._photo_url = f"{self._url}/photo"
+        self._stream_url = f"{self._url}{self._stream_path}"
+
+
+    def _create_http_session(self):
+        """
+        Create HTTP session with pool of keep-alive connections, which is reused by all
+        drive, turn and photo requests instead of opening new TCP connection for each of them.
+        """
+        retry = Retry(
+            total=self._retries,
+            connect=self._retries,
+            read=0,
+            backoff_factor=self._backoff_factor,
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self._pool_size,
+            max_retries=retry,
+            pool_block=False
+        )
+        self._http_session = requests.Session()
+        self._http_session.mount("http://", adapter)
+
+
+    def _create_command_scheduler(self):
+        """
+        Servo commands (turns and wheels centering) are sent by scheduler, which keeps
+        them spaced for servo to settle without blocking control loop.
+        """
+        self._command_scheduler = CommandScheduler(self._send_turn_request, self._servo_spacing_s)
+
+
+    def close(self):
+        """Send pending servo command and close all pooled connections to robotic car."""
+        self.stop_stream()
+        self._command_scheduler.shutdown()
+        self._http_session.close()
 
 
     def send_request(self, command: SteeringCommand):
@@ -100,68 +162,60 @@ class Communicator:
 
 
     def start_drive(self):
-        """Handle starting robotic car drive: start driving straight and set proper flags."""
+        """Handle starting robotic car drive: center wheels and start driving straight."""
         self.center_wheels()
         self.drive(self._standard_forward)
-        self._is_driving_forward = True
-        self._is_driving_backward = False
 
 
     def stop_drive(self):
-        """Handle stopping robotic car drive: start driving straight and set proper flags."""
+        """Handle stopping robotic car drive: stop and center wheels."""
         self.stop()
         self.center_wheels()
-        self._is_driving_forward = False
-        self._is_driving_backward = False
 
 
     def forward_drive(self):
-        """Handle forward drive: start driving straight and set proper flags."""
-        if not self._is_wheels_centered:
-            self.center_wheels()
-        if not self._is_driving_forward:
-            self.drive(self._standard_forward)
-            self._is_driving_forward = True
-            self._is_driving_backward = False
+        """Handle forward drive: center wheels and drive straight if not done yet."""
+        self.center_wheels()
+        self.drive(self._standard_forward)
 
 
     def back_drive(self):
-        """Handle back drive: start driving back and set proper flags."""
+        """Handle back drive: start driving back if not done yet."""
         self.drive(self._standard_backward)
-        if not self._is_driving_backward:
-            self.drive(self._standard_backward)
-            self._is_driving_forward = False
-            self._is_driving_backward = True
 
 
     def drive(self, speed_parameter: int):
         """
         Method responsible for sending GET request with speed parameter for 
-        driving forward or backward.
+        driving forward or backward. Request is skipped if car already drives with given speed.
         """
         if speed_parameter < self._max_forward and speed_parameter > self._max_backward:
-            url_to_send = f"{self._drive_url}{speed_parameter}"
-            self._send_get_request(url_to_send, speed_parameter)
+            if self._actuator_state.update_speed(speed_parameter):
+                url_to_send = f"{self._drive_url}{speed_parameter}"
+                self._send_speed_request(url_to_send, speed_parameter)
 
 
     def stop(self):
         """
         Method responsible for sending GET request for stop the robotic car.
+        Request is skipped if car is already stopped.
         """
-        url_to_send = f"{self._drive_url}{self._stop}"
-        self._send_get_request(url_to_send, self._stop)
+        if self._actuator_state.update_speed(self._stop):
+            url_to_send = f"{self._drive_url}{self._stop}"
+            self._send_speed_request(url_to_send, self._stop)
 
 
     def turn(self, command: SteeringCommand):
         """
-        Method responsible for sending GET request with turn type parameter.
+        Method responsible for scheduling GET request with turn type parameter.
+        Request is sent by command scheduler and may be replaced by newer servo command
+        if it wasn't sent yet. Request is skipped if wheels are already turned that way.
         """
-        self._is_wheels_centered = False
         turn_parameter = self._map_turn_car_command(command)
         turn_parameter = self._turn_parameter_mapper(turn_parameter)
-        url_to_send = f"{self._turn_url}{turn_parameter}"
-        time.sleep(self._turn_sleep_s)
-        self._send_get_request(url_to_send, turn_parameter)
+        if self._actuator_state.update_turn(turn_parameter):
+            url_to_send = f"{self._turn_url}{turn_parameter}"
+            self._command_scheduler.schedule(url_to_send, turn_parameter)
 
 
     def _map_turn_car_command(self, command: SteeringCommand):
@@ -183,12 +237,13 @@ class Communicator:
 
     def center_wheels(self):
         """
-        Method responsible for sending GET request for straighten the robotic car wheels.
+        Method responsible for scheduling GET request for straighten the robotic car wheels.
+        Request is skipped if wheels are already centered.
         """
-        self._is_wheels_centered = True
         turn_parameter = self._turn_parameter_mapper(self._center)
-        url_to_send = f"{self._turn_url}{turn_parameter}"
-        self._send_get_request(url_to_send, turn_parameter)
+        if self._actuator_state.update_turn(turn_parameter):
+            url_to_send = f"{self._turn_url}{turn_parameter}"
+            self._command_scheduler.schedule(url_to_send, turn_parameter)
 
 
     def _turn_parameter_mapper(self, turn_parameter: int) -> int:
@@ -201,11 +256,37 @@ class Communicator:
         return turn_parameter
 
 
-    def _send_get_request(self, url_to_send: str, parameter: int):
+    def _send_speed_request(self, url_to_send: str, parameter: int):
+        if not self._send_get_request(url_to_send, parameter):
+            self._actuator_state.invalidate_speed()
+
+
+    def _send_turn_request(self, url_to_send: str, parameter: int):
+        if not self._send_get_request(url_to_send, parameter):
+            self._actuator_state.invalidate_turn()
+
+
+    def _send_get_request(self, url_to_send: str, parameter: int) -> bool:
+        """
+        Send GET request to robotic car. Returns False when request failed, so state of
+        actuators is unknown.
+        """
+        self._actuator_state.register_sent_command()
         try:
-            requests.get(url = url_to_send, params = parameter, timeout = self._request_timeout)
+            with self._profiler.measure("command request"):
+                response = self._http_session.get(
+                    url=url_to_send,
+                    params=parameter,
+                    timeout=self._request_timeout
+                )
+                response.close()
+            return True
         except requests.Timeout:
             print(f"TIMEOUT when sending {url_to_send} request")
+        except requests.ConnectionError:
+            print(f"CONNECTION ERROR when sending {url_to_send} request")
+
+        return False
 
 
     def take_photo(self) -> requests.models.Response:
@@ -214,7 +295,7 @@ class Communicator:
         Method returns .jpg file stored in bytes.
         """
         try:
-            response = requests.get(
+            response = self._http_session.get(
                 url=self._photo_url,
                 timeout=self._request_timeout,
                 stream=True
@@ -222,33 +303,133 @@ class Communicator:
             return response
         except requests.Timeout:
             print("TIMEOUT during taking picture!")
+        except requests.ConnectionError:
+            print("CONNECTION ERROR during taking picture!")
 
         return None
 
 
+    def start_stream(self):
+        """
+        Start receiving continuous MJPEG stream from robotic car's camera. Since then
+        fetch_frame() returns the newest frame of the stream instead of taking a photo.
+        """
+        self._stream_reader = MjpegStreamReader(self._open_stream)
+        self._stream_reader.start()
+
+
+    def stop_stream(self):
+        """Stop receiving MJPEG stream and print amount of dropped stale frames."""
+        if self._stream_reader is not None:
+            self._stream_reader.stop()
+            dropped_amount = self._stream_reader.get_dropped_frames_amount()
+            print(f"Stale stream frames dropped: {dropped_amount}")
+            self._stream_reader = None
+
+
+    def _open_stream(self) -> requests.models.Response:
+        try:
+            response = self._http_session.get(
+                url=self._stream_url,
+                timeout=self._request_timeout,
+                stream=True
+            )
+        except requests.Timeout:
+            print("TIMEOUT when opening camera stream!")
+            return None
+        except requests.ConnectionError:
+            print("CONNECTION ERROR when opening camera stream!")
+            return None
+
+        if response.status_code != 200:
+            print(f"Camera stream not available, status code: {response.status_code}")
+            response.close()
+            return None
+
+        return response
+
+
+    def fetch_frame(self) -> Frame:
+        """
+        Method responsible for getting a picture from robotic car's camera. If camera stream
+        is started, the newest frame of the stream is returned. Otherwise photo is taken and
+        read straight from the response stream into reusable frame buffer.
+        Method returns frame with memoryview of .jpg file as content, or None if photo wasn't
+        received. Frame should be released when it's no longer used.
+        If recording is enabled, frame is also saved on a disk.
+        """
+        with self._profiler.measure("photo fetch"):
+            if self._stream_reader is not None:
+                frame = self._stream_reader.get_latest_frame(self._request_timeout)
+            else:
+                frame = self._take_photo_into_buffer()
+
+        if frame is not None and self._recording_subdirectory is not None:
+            self.save_frame(frame.get_content(), self._recording_subdirectory)
+
+        return frame
+
+
+    def _take_photo_into_buffer(self) -> Frame:
+        response = self.take_photo()
+        if response is None:
+            return None
+
+        # Photo is taken by the car when request arrives, so receiving response headers
+        # is the closest known moment to capture time.
+        captured_at = time.monotonic()
+        frame = None
+        try:
+            if response.status_code == 200:
+                frame = self._frame_reader.read(response.raw, captured_at)
+        except (urllib3.exceptions.HTTPError, OSError):
+            print("ERROR during reading picture!")
+        finally:
+            response.close()
+
+        return frame
+
+
+    def set_profiler(self, profiler: LatencyProfiler):
+        """Profiler measuring photo fetching and steering command requests setter."""
+        self._profiler = profiler
+
+
+    def set_recording_subdirectory(self, subdirectory_to_store: str):
+        """
+        Enable saving every fetched frame in given dataset subdirectory. None disables it.
+        """
+        self._recording_subdirectory = subdirectory_to_store
+
+
     def take_photo_and_save(self, subdirectory_to_store: str = ""):
         """
         Method responsible for taking a picture with robotic car's camera and saving it on a disk.
         Use for creating own dataset.
         """
-        response = self.take_photo()
-        if response is not None:
-            self._save_photo_on_disc(response, subdirectory_to_store)
+        frame = self.fetch_frame()
+        if frame is not None:
+            self.save_frame(frame.get_content(), subdirectory_to_store)
+            frame.release()
         else:
             print("Didn't receive a photo from robotic car!")
 
 
-    def _save_photo_on_disc(self, response: requests.Response, subdirectory_to_store: str):
+    def save_frame(self, frame: memoryview, subdirectory_to_store: str):
+        """
+        Method responsible for saving .jpg frame on a disk without copying it.
+        """
         name_based_on_date = DateToStr.parse_date(DateNameType.DATE_HOUR_MINUTE_SECONDS)
-        filename = f"img_{name_based_on_date}.jpg"
+        self._saved_frames_amount += 1
+        filename = f"img_{name_based_on_date}_{self._saved_frames_amount}.jpg"
         subdirectory_to_store = self._fix_separator_in_subdirectory(subdirectory_to_store)
         directory_path =  f"{self._path_to_dataset}{subdirectory_to_store}"
         self._create_dataset_directory(directory_path)
         path = f"{directory_path}{filename}"
-        if response.status_code == 200:
-            with open(file=path, mode='wb') as file:
-                shutil.copyfileobj(response.raw, file)
-                print(f'Sucessfully taken photo: {filename}')
+        with open(file=path, mode='wb') as file:
+            file.write(frame)
+            print(f'Sucessfully saved photo: {filename}')
+        self._dataset_manifest.add_file(path)
 
 
     def _fix_separator_in_subdirectory(self, subdirectory: str) -> str:
@@ -268,8 +449,23 @@ class Communicator:
         return self._last_command
 
 
+    def get_actuator_state(self) -> ActuatorState:
+        """Actuator state getter."""
+        return self._actuator_state
+
+
+    def print_commands_statistics(self):
+        """
+        Print statistics of sent, skipped and replaced steering commands on console.
+        """
+        self._actuator_state.print_statistics()
+        replaced_amount = self._command_scheduler.get_replaced_commands_amount()
+        print(f"    Servo commands replaced before sending: {replaced_amount}")
+
+
 if __name__ == "__main__":
     communicator = Communicator()
     for _ in range(0, 20):
         communicator.take_photo_and_save("../dataset/train/thrash")
         time.sleep(1)
+    communicator.close()
@@ -0,0 +1,159 @@
+"""
+DatasetManifest class is responsible for keeping persistent index of images stored in dataset
+directory, so the directory tree doesn't have to be scanned to know classes and files.
+"""
+
+import os
+import json
+import threading
+
+
+class DatasetManifest:
+    """
+    Class keeps index of images in dataset directory: relative path, size, modification time
+    and label of every image. Dataset has ImageFolder layout: subset/label/image.jpg
+    (e.g. train/forward/img_1.jpg), so subset and label are read from the path.
+    Index is stored in manifest.json file. Images added by the application are appended as
+    single lines to manifest journal, which is merged into the index when it's saved, so
+    adding an image costs the same regardless of dataset size.
+    """
+
+    _IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, dataset_directory: str):
+        self._dataset_directory = os.path.abspath(dataset_directory)
+        self._manifest_path = os.path.join(self._dataset_directory, "manifest.json")
+        self._journal_path = os.path.join(self._dataset_directory, "manifest.journal")
+        self._entries = None
+        self._lock = threading.Lock()
+
+
+    def add_file(self, path: str):
+        """
+        Add image saved in dataset directory to the manifest.
+        """
+        relative_path = self._get_relative_path(path)
+        if relative_path is None:
+            return
+
+        entry = self._create_entry(relative_path)
+        with self._lock:
+            if self._entries is not None:
+                self._entries[relative_path] = entry
+            with open(file=self._journal_path, mode="a", encoding="utf-8") as file:
+                file.write(json.dumps({"path": relative_path, **entry}) + "\n")
+
+
+    def refresh(self) -> bool:
+        """
+        Synchronize manifest with dataset directory: add new and modified images and remove
+        deleted ones. Only file metadata is read. Returns True if anything changed.
+        """
+        entries = self._get_entries()
+        scanned_entries = {}
+        for root, _, filenames in os.walk(self._dataset_directory):
+            for filename in filenames:
+                if filename.lower().endswith(self._IMAGE_EXTENSIONS):
+                    relative_path = self._get_relative_path(os.path.join(root, filename))
+                    scanned_entries[relative_path] = self._create_entry(relative_path)
+
+        is_changed = scanned_entries != entries
+        if is_changed:
+            with self._lock:
+                self._entries = scanned_entries
+            self.save()
+
+        return is_changed
+
+
+    def save(self):
+        """
+        Save whole manifest and clear its journal.
+        """
+        with self._lock:
+            entries = self._entries or {}
+            # Temporary file is unique per process, so processes saving manifest at once
+            # (e.g. parallel trainings) don't replace each other's file.
+            temporary_path = f"{self._manifest_path}.{os.getpid()}.tmp"
+            with open(file=temporary_path, mode="w", encoding="utf-8") as file:
+                json.dump({"entries": entries}, file)
+            os.replace(temporary_path, self._manifest_path)
+            try:
+                os.remove(self._journal_path)
+            except FileNotFoundError:
+                pass
+
+
+    def get_classes(self, subset: str) -> list:
+        """
+        Sorted labels of images in dataset subset (e.g. 'train'). Manifest is built, if it
+        doesn't exist yet.
+        """
+        return sorted({entry["label"] for entry in self.get_entries(subset)})
+
+
+    def get_entries(self, subset: str) -> list:
+        """
+        Entries (dictionaries with path, size, mtime_ns and label) of labeled images in dataset
+        subset, sorted by path. Path is absolute.
+        """
+        entries = self._get_entries()
+        subset_entries = []
+        for relative_path in sorted(entries):
+            entry = entries[relative_path]
+            if entry["subset"] == subset and entry["label"] is not None:
+                path = os.path.join(self._dataset_directory, *relative_path.split("/"))
+                subset_entries.append({"path": path, **entry})
+
+        return subset_entries
+
+
+    def _get_entries(self) -> dict:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read_entries()
+                is_missing = self._entries is None
+            else:
+                is_missing = False
+        if is_missing:
+            self._entries = {}
+            if not self.refresh():
+                self.save()
+
+        return self._entries
+
+
+    def _read_entries(self) -> dict:
+        if not os.path.isfile(self._manifest_path):
+            return None
+
+        with open(file=self._manifest_path, mode="r", encoding="utf-8") as file:
+            entries = json.load(file)["entries"]
+        if os.path.isfile(self._journal_path):
+            with open(file=self._journal_path, mode="r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry.pop("path")] = entry
+
+        return entries
+
+
+    def _get_relative_path(self, path: str) -> str:
+        relative_path = os.path.relpath(os.path.abspath(path), self._dataset_directory)
+        if relative_path.startswith(".."):
+            return None
+
+        return relative_path.replace(os.sep, "/")
+
+
+    def _create_entry(self, relative_path: str) -> dict:
+        stat = os.stat(os.path.join(self._dataset_directory, *relative_path.split("/")))
+        parts = relative_path.split("/")
+
+        return {
+            "subset": parts[0] if len(parts) > 1 else None,
+            "label": parts[1] if len(parts) > 2 else None,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
@@ -0,0 +1,65 @@
+"""
+Frame class is representing single .jpg photo received from robotic car's camera together with
+its timing metadata.
+"""
+
+import time
+
+
+class Frame:
+    """
+    Class is representing .jpg photo stored in frame buffer and its timings: time when it was
+    captured, time of its decoding and age of the frame when inference started. Times are
+    measured with time.monotonic(). Frame should be released when it is no longer used,
+    so its buffer can be reused for next frames.
+    """
+
+    def __init__(self, content: memoryview, captured_at: float, release_buffer=None):
+        self._content = content
+        self._captured_at = captured_at
+        self._release_buffer = release_buffer
+        self._decode_time_s = None
+        self._inference_age_s = None
+
+
+    def release(self):
+        """Give frame buffer back for reuse. Content of the frame mustn't be used since then."""
+        if self._release_buffer is not None:
+            self._content.release()
+            self._release_buffer()
+            self._release_buffer = None
+
+
+    def get_content(self) -> memoryview:
+        """Content of .jpg file getter."""
+        return self._content
+
+
+    def get_captured_at(self) -> float:
+        """Capture time getter."""
+        return self._captured_at
+
+
+    def get_age(self) -> float:
+        """Time passed since frame was captured in seconds."""
+        return time.monotonic() - self._captured_at
+
+
+    def mark_inference_start(self):
+        """Store age of the frame at the moment its inference starts."""
+        self._inference_age_s = self.get_age()
+
+
+    def set_decode_time(self, decode_time_s: float):
+        """Decode time setter."""
+        self._decode_time_s = decode_time_s
+
+
+    def get_decode_time(self) -> float:
+        """Decode time getter."""
+        return self._decode_time_s
+
+
+    def get_inference_age(self) -> float:
+        """Age of the frame at inference start getter."""
+        return self._inference_age_s
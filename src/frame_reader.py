@@ -0,0 +1,117 @@
+"""
+FrameReader class is responsible for reading .jpg frames from HTTP response stream into
+reusable buffers. MemoryViewStream class lets such frame be read as a file without copying it.
+"""
+
+import io
+import threading
+
+from frame import Frame
+
+
+class FrameReader:
+    """
+    Class reads frames from stream (e.g. raw socket of HTTP response) into pool of reusable
+    buffers and returns them as frames with memoryview content, so the same frame can be passed
+    to classifier and recorder without copying. Buffer goes back to the pool when frame is
+    released. If all buffers are in use, new one is allocated.
+    """
+
+    def __init__(self, buffers_amount: int = 4, initial_buffer_size: int = 64 * 1024):
+        self._initial_buffer_size = initial_buffer_size
+        self._free_buffers = [bytearray(initial_buffer_size) for _ in range(buffers_amount)]
+        self._lock = threading.Lock()
+
+
+    def read(self, stream, captured_at: float) -> Frame:
+        """
+        Read whole stream into free buffer from the pool. Returns frame with memoryview
+        of read data as content.
+        """
+        buffer = self._acquire_buffer()
+        length = 0
+        while True:
+            if length == len(buffer):
+                buffer = self._grow_buffer(buffer, length)
+            with memoryview(buffer) as buffer_view:
+                with buffer_view[length:] as free_part:
+                    read_amount = stream.readinto(free_part)
+            if not read_amount:
+                break
+            length += read_amount
+
+        return Frame(
+            memoryview(buffer)[:length],
+            captured_at,
+            lambda: self._release_buffer(buffer)
+        )
+
+
+    def _acquire_buffer(self) -> bytearray:
+        with self._lock:
+            if self._free_buffers:
+                return self._free_buffers.pop()
+
+        return bytearray(self._initial_buffer_size)
+
+
+    def _release_buffer(self, buffer: bytearray):
+        with self._lock:
+            self._free_buffers.append(buffer)
+
+
+    def _grow_buffer(self, buffer: bytearray, length: int) -> bytearray:
+        """
+        Replace too small buffer with twice as big one.
+        """
+        grown_buffer = bytearray(2 * max(length, 1))
+        grown_buffer[:length] = buffer[:length]
+
+        return grown_buffer
+
+
+class MemoryViewStream(io.RawIOBase):
+    """
+    Class is read-only, seekable file-like view over memoryview, which lets image decoders
+    read frame directly from frame buffer.
+    """
+
+    def __init__(self, frame: memoryview):
+        io.RawIOBase.__init__(self)
+        self._frame = frame
+        self._position = 0
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def seekable(self) -> bool:
+        return True
+
+
+    def readinto(self, buffer) -> int:
+        read_amount = max(0, min(len(buffer), len(self._frame) - self._position))
+        buffer[:read_amount] = self._frame[self._position:self._position + read_amount]
+        self._position += read_amount
+
+        return read_amount
+
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        match whence:
+            case io.SEEK_SET:
+                self._position = offset
+            case io.SEEK_CUR:
+                self._position += offset
+            case io.SEEK_END:
+                self._position = len(self._frame) + offset
+            case _:
+                raise ValueError(f"Invalid whence value: {whence}")
+        self._position = max(0, self._position)
+
+        return self._position
+
+
+    def tell(self) -> int:
+        return self._position
@@ -0,0 +1,60 @@
+"""
+FrameStatistics class is responsible for collecting timing metrics of frames used for steering
+robotic car.
+"""
+
+import threading
+
+from frame import Frame
+
+
+class FrameStatistics:
+    """
+    Class collects capture time, decode time and age at inference of every classified frame
+    and prints their summary, which tells how old images the car acted on.
+    """
+
+    def __init__(self):
+        self._captured_at = []
+        self._decode_times_s = []
+        self._inference_ages_s = []
+        self._lock = threading.Lock()
+
+
+    def record(self, frame: Frame):
+        """Store timing metrics of classified frame."""
+        with self._lock:
+            self._captured_at.append(frame.get_captured_at())
+            self._decode_times_s.append(frame.get_decode_time())
+            self._inference_ages_s.append(frame.get_inference_age())
+
+
+    def get_frames_amount(self) -> int:
+        """Amount of recorded frames getter."""
+        return len(self._captured_at)
+
+
+    def print_statistics(self, dropped_frames_amount: int = 0):
+        """
+        Print summary of frames metrics on console.
+        """
+        print("Frames stats:")
+        print(f"    Classified: {self.get_frames_amount()}")
+        print(f"    Dropped as stale: {dropped_frames_amount}")
+        if not self._captured_at:
+            return
+
+        self._print_times("Age at inference", self._inference_ages_s)
+        self._print_times("Decode time", self._decode_times_s)
+        duration_s = self._captured_at[-1] - self._captured_at[0]
+        if duration_s > 0:
+            print(f"    Frames per second: {(len(self._captured_at) - 1) / duration_s:.2f}")
+
+
+    def _print_times(self, name: str, times_s: list):
+        times_s = [time_s for time_s in times_s if time_s is not None]
+        if not times_s:
+            return
+        mean_ms = 1000 * sum(times_s) / len(times_s)
+        max_ms = 1000 * max(times_s)
+        print(f"    {name} [ms]: mean {mean_ms:.1f}, max {max_ms:.1f}")
@@ -0,0 +1,147 @@
+"""
+LatencyProfiler class is responsible for measuring duration of control loop stages, such as
+taking photo, decoding it, forward pass of the model and sending steering commands.
+"""
+
+import os
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+
+class LatencyProfiler:
+    """
+    Class measures durations of named stages. Last ring_size durations of each stage are kept
+    in a ring buffer and summarized with percentiles. Optionally every measurement is also
+    stored as trace event, which can be saved in Chrome trace format (e.g. for chrome://tracing
+    or Perfetto). Disabled profiler measures nothing and costs almost nothing.
+    """
+
+    def __init__(self, is_enabled: bool = False, ring_size: int = 1000, trace_path: str = None,
+                 max_trace_events: int = 200000):
+        self._is_enabled = is_enabled
+        self._ring_size = ring_size
+        self._trace_path = trace_path
+
+        self._durations_s = {}
+        self._trace_events = deque(maxlen=max_trace_events) if trace_path else None
+        self._start_time = time.perf_counter()
+        self._lock = threading.Lock()
+        self._null_measurement = nullcontext()
+
+
+    def measure(self, stage: str):
+        """
+        Context manager measuring duration of the stage executed inside with statement.
+        """
+        if not self._is_enabled:
+            return self._null_measurement
+
+        return _StageMeasurement(self, stage)
+
+
+    def record(self, stage: str, start_s: float, duration_s: float):
+        """
+        Store duration of the stage which started at start_s (time.perf_counter() value).
+        """
+        if not self._is_enabled:
+            return
+
+        with self._lock:
+            durations_s = self._durations_s.get(stage)
+            if durations_s is None:
+                durations_s = deque(maxlen=self._ring_size)
+                self._durations_s[stage] = durations_s
+            durations_s.append(duration_s)
+
+            if self._trace_events is not None:
+                self._trace_events.append({
+                    "name": stage,
+                    "ph": "X",
+                    "ts": (start_s - self._start_time) * 1e6,
+                    "dur": duration_s * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.current_thread().name,
+                })
+
+
+    def is_enabled(self) -> bool:
+        """Information if profiler is enabled getter."""
+        return self._is_enabled
+
+
+    def get_percentiles(self, stage: str, percentiles: tuple = (50, 95, 99)) -> dict:
+        """
+        Percentiles of stored durations of the stage in seconds. Returns empty dictionary if
+        the stage was not measured.
+        """
+        with self._lock:
+            durations_s = sorted(self._durations_s.get(stage, ()))
+        if not durations_s:
+            return {}
+
+        result = {}
+        for percentile in percentiles:
+            index = max(0, int(round(percentile / 100 * len(durations_s))) - 1)
+            result[percentile] = durations_s[min(index, len(durations_s) - 1)]
+
+        return result
+
+
+    def get_stages(self) -> list:
+        """Names of measured stages getter."""
+        with self._lock:
+            return list(self._durations_s.keys())
+
+
+    def print_statistics(self):
+        """
+        Print percentiles of durations of every measured stage on console.
+        """
+        if not self._is_enabled:
+            return
+
+        print("Latency stats [ms]:")
+        for stage in self.get_stages():
+            percentiles = self.get_percentiles(stage)
+            samples_amount = len(self._durations_s[stage])
+            print(f"    {stage:<20} p50 {1000 * percentiles[50]:8.2f}   "
+                  f"p95 {1000 * percentiles[95]:8.2f}   "
+                  f"p99 {1000 * percentiles[99]:8.2f}   (n={samples_amount})")
+
+
+    def save_trace(self):
+        """
+        Save stored trace events in Chrome trace format, if trace file was specified.
+        """
+        if not self._is_enabled or self._trace_events is None:
+            return
+
+        with self._lock:
+            trace = {"traceEvents": list(self._trace_events), "displayTimeUnit": "ms"}
+        with open(file=self._trace_path, mode="w", encoding="utf-8") as file:
+            json.dump(trace, file)
+        print(f"Trace saved in {self._trace_path}")
+
+
+class _StageMeasurement:
+    """
+    Context manager measuring single execution of the stage.
+    """
+
+    def __init__(self, profiler: LatencyProfiler, stage: str):
+        self._profiler = profiler
+        self._stage = stage
+        self._start_s = None
+
+
+    def __enter__(self):
+        self._start_s = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profiler.record(self._stage, self._start_s, time.perf_counter() - self._start_s)
+        return False
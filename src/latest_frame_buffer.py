@@ -0,0 +1,66 @@
+"""
+LatestFrameBuffer class is single-slot buffer between capturing and classifying photos,
+in which the newest frame always wins.
+"""
+
+import threading
+
+from frame import Frame
+
+
+class LatestFrameBuffer:
+    """
+    Class is single-slot frame buffer. Producer never waits: new frame overwrites the one
+    which wasn't taken yet, and overwritten frame is released and counted as dropped.
+    Consumer always takes the newest frame.
+    """
+
+    def __init__(self):
+        self._frame = None
+        self._dropped_frames_amount = 0
+        self._is_closed = False
+        self._condition = threading.Condition()
+
+
+    def put(self, frame: Frame):
+        """Put frame into the buffer, replacing not taken one."""
+        with self._condition:
+            dropped_frame = self._frame
+            self._frame = frame
+            if dropped_frame is not None:
+                self._dropped_frames_amount += 1
+            self._condition.notify()
+
+        if dropped_frame is not None:
+            dropped_frame.release()
+
+
+    def take(self, timeout_s: float) -> Frame:
+        """
+        Take the newest frame from the buffer, waiting for it at most timeout_s seconds.
+        Returns None if no frame arrived within timeout or buffer was closed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._frame is not None or self._is_closed,
+                                     timeout=timeout_s)
+            frame = self._frame
+            self._frame = None
+
+        return frame
+
+
+    def close(self):
+        """Wake up waiting consumer and release frame which wasn't taken."""
+        with self._condition:
+            self._is_closed = True
+            frame = self._frame
+            self._frame = None
+            self._condition.notify_all()
+
+        if frame is not None:
+            frame.release()
+
+
+    def get_dropped_frames_amount(self) -> int:
+        """Amount of frames overwritten before being taken getter."""
+        return self._dropped_frames_amount
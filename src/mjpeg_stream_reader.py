@@ -0,0 +1,176 @@
+"""
+MjpegStreamReader class is responsible for receiving continuous multipart MJPEG stream from
+robotic car's camera and keeping only the newest frame.
+"""
+
+import io
+import threading
+import time
+import requests
+import urllib3
+
+from frame import Frame
+from latest_frame_buffer import LatestFrameBuffer
+
+
+class MjpegStreamReader:
+    """
+    Class reads frames of multipart MJPEG stream in a background thread into latest frame
+    buffer. Only the newest frame is kept: frames which were not taken by the controller
+    before next one arrived are dropped. Connection is reopened when stream breaks.
+    """
+
+    def __init__(self, open_stream, reconnect_delay_s: float = 0.5):
+        self._open_stream = open_stream
+        self._reconnect_delay_s = reconnect_delay_s
+
+        self._frame_buffer = LatestFrameBuffer()
+
+        self._response = None
+        self._is_running = False
+        self._reader_thread = None
+
+
+    def start(self):
+        """Start receiving frames in a background thread."""
+        self._is_running = True
+        self._reader_thread = threading.Thread(target=self._read_stream, name="mjpeg-reader",
+                                               daemon=True)
+        self._reader_thread.start()
+
+
+    def stop(self):
+        """Stop receiving frames and close the stream."""
+        self._is_running = False
+        response = self._response
+        if response is not None:
+            response.close()
+        self._frame_buffer.close()
+        if self._reader_thread is not None:
+            self._reader_thread.join()
+
+
+    def get_latest_frame(self, timeout_s: float) -> Frame:
+        """
+        Wait for a frame newer than previously taken one and return it.
+        Returns None if no new frame arrived within timeout.
+        """
+        return self._frame_buffer.take(timeout_s)
+
+
+    def get_dropped_frames_amount(self) -> int:
+        """Amount of stale frames dropped before being taken getter."""
+        return self._frame_buffer.get_dropped_frames_amount()
+
+
+    def _read_stream(self):
+        while self._is_running:
+            try:
+                self._response = self._open_stream()
+                if self._response is not None:
+                    self._read_frames(self._response)
+            except (urllib3.exceptions.HTTPError, requests.RequestException, OSError,
+                    ValueError) as ex:
+                if self._is_running:
+                    print(f"MJPEG stream error: {ex}")
+            except Exception:
+                # Response closed by stop() while it's read may fail with any exception
+                # (e.g. AttributeError inside urllib3), which means clean exit.
+                if self._is_running:
+                    raise
+            finally:
+                if self._response is not None:
+                    self._response.close()
+                    self._response = None
+
+            if self._is_running:
+                time.sleep(self._reconnect_delay_s)
+
+
+    def _read_frames(self, response):
+        boundary = self._parse_boundary(response.headers.get("Content-Type", ""))
+        stream = io.BufferedReader(response.raw, buffer_size=64 * 1024)
+        delimiter = b"--" + boundary
+
+        self._skip_to_delimiter(stream, delimiter)
+        while self._is_running:
+            headers = self._read_part_headers(stream)
+            if headers is None:
+                return
+
+            captured_at = time.monotonic()
+            content_length = headers.get(b"content-length")
+            if content_length is not None:
+                content = self._read_exactly(stream, int(content_length))
+                if content is None:
+                    return
+                self._frame_buffer.put(Frame(memoryview(content), captured_at))
+                self._skip_to_delimiter(stream, delimiter)
+            else:
+                content = self._read_to_delimiter(stream, delimiter)
+                if content is None:
+                    return
+                self._frame_buffer.put(Frame(memoryview(content), captured_at))
+
+
+    def _parse_boundary(self, content_type: str) -> bytes:
+        for parameter in content_type.split(";"):
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "boundary":
+                value = value.strip('"')
+                if value.startswith("--"):
+                    value = value[2:]
+                return value.encode("ascii")
+
+        raise ValueError(f"No boundary in MJPEG stream content type: {content_type}")
+
+
+    def _skip_to_delimiter(self, stream, delimiter: bytes):
+        while self._is_running:
+            line = stream.readline()
+            if not line:
+                raise ValueError("MJPEG stream closed")
+            if line.strip() == delimiter:
+                return
+
+
+    def _read_part_headers(self, stream) -> dict:
+        headers = {}
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                return headers
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+
+
+    def _read_exactly(self, stream, length: int) -> bytearray:
+        frame = bytearray(length)
+        with memoryview(frame) as frame_view:
+            read_amount = 0
+            while read_amount < length:
+                chunk_amount = stream.readinto(frame_view[read_amount:])
+                if not chunk_amount:
+                    return None
+                read_amount += chunk_amount
+
+        return frame
+
+
+    def _read_to_delimiter(self, stream, delimiter: bytes) -> bytearray:
+        """
+        Read part without Content-Length header: everything up to next delimiter line.
+        """
+        frame = bytearray()
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            if line.strip() == delimiter:
+                if frame.endswith(b"\r\n"):
+                    del frame[-2:]
+                return frame
+            frame.extend(line)
@@ -0,0 +1,110 @@
+"""
+PipelinedLoop class is responsible for running robotic car control loop as a pipeline of
+separate stages: taking photo, classifying it and sending steering commands.
+"""
+
+import queue
+import threading
+
+from communicator import Communicator
+from ai_model.model_handler import ModelHandler
+from latest_frame_buffer import LatestFrameBuffer
+from frame_statistics import FrameStatistics
+
+
+class PipelinedLoop:
+    """
+    Class runs photo fetching, image classification and commands dispatching in separate
+    threads. Thanks to that, next photo is already requested from robotic car while current
+    one is being classified. Photos are passed to classification through latest frame buffer,
+    so always the newest one is classified, and predictions are passed to dispatching through
+    bounded queue.
+    """
+
+    def __init__(self, communicator: Communicator, model_handler: ModelHandler,
+                 on_prediction, exit_flag: threading.Event,
+                 frame_statistics: FrameStatistics, queue_size: int = 1):
+        self._communicator = communicator
+        self._model_handler = model_handler
+        self._on_prediction = on_prediction
+        self._exit_flag = exit_flag
+        self._frame_statistics = frame_statistics
+
+        self._frame_buffer = LatestFrameBuffer()
+        self._predictions_queue = queue.Queue(maxsize=queue_size)
+        self._poll_timeout_s = 0.1
+
+
+    def run(self):
+        """
+        Start all pipeline stages and wait until exit flag is set and all of them finish.
+        """
+        stages = [
+            threading.Thread(target=self._capture_stage, name="capture-stage"),
+            threading.Thread(target=self._inference_stage, name="inference-stage"),
+            threading.Thread(target=self._dispatch_stage, name="dispatch-stage"),
+        ]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+        self._frame_buffer.close()
+
+
+    def get_dropped_frames_amount(self) -> int:
+        """Amount of photos replaced by newer ones before classification getter."""
+        return self._frame_buffer.get_dropped_frames_amount()
+
+
+    def _capture_stage(self):
+        while not self._exit_flag.is_set():
+            frame = self._communicator.fetch_frame()
+            if frame is not None:
+                self._frame_buffer.put(frame)
+            else:
+                print("No response")
+
+
+    def _inference_stage(self):
+        while not self._exit_flag.is_set():
+            frame = self._frame_buffer.take(self._poll_timeout_s)
+            if frame is None:
+                continue
+            probabilities = self._model_handler.predict_frame(frame)
+            frame.release()
+            self._frame_statistics.record(frame)
+            self._put(self._predictions_queue, (probabilities, frame))
+
+
+    def _dispatch_stage(self):
+        while not self._exit_flag.is_set():
+            prediction = self._get(self._predictions_queue)
+            if prediction is None:
+                continue
+            probabilities, frame = prediction
+            self._on_prediction(probabilities, frame)
+
+
+    def _put(self, stage_queue: queue.Queue, item):
+        """
+        Put item into the queue. Waiting is interrupted when exit flag is set.
+        """
+        while not self._exit_flag.is_set():
+            try:
+                stage_queue.put(item, timeout=self._poll_timeout_s)
+                return
+            except queue.Full:
+                continue
+
+
+    def _get(self, stage_queue: queue.Queue):
+        """
+        Get item from the queue. Returns None when exit flag was set before item arrived.
+        """
+        while not self._exit_flag.is_set():
+            try:
+                return stage_queue.get(timeout=self._poll_timeout_s)
+            except queue.Empty:
+                continue
+
+        return None
@@ -3,28 +3,41 @@ Main app session.
 """
 
 import sys
+import time
 import threading
+import torch
 
 from commandline_args_parser import CommandLineArgsParser
 from ai_model.model_handler import ModelHandler
+from ai_model.hyperparameter_sweep import HyperparameterSweep
 from communicator import Communicator
 from steering_command import SteeringCommand
 from predicted_class import PredictedClass
-from predicted_class_stack import PredictedClassStack
+from temporal_smoother import TemporalSmoother
+from pipelined_loop import PipelinedLoop
+from async_communicator import AsyncCommunicator
+from async_loop import AsyncLoop
+from frame import Frame
+from frame_statistics import FrameStatistics
+from latency_profiler import LatencyProfiler
 from timer import Timer
 from music_player import MusicPlayer
+from settings_readers.smoothing_settings_reader import SmoothingSettingsReader
 
 
 class Session:
     """
     Class is responsible for main app session. It calls training model,
     creates object responsible for communication with robotic car and 
-    steers robotic car.
+    steers robotic car. Parsed command line arguments and address of the car can be given
+    instead of being read from command line and network settings (e.g. by benchmarks).
     """
 
-    def __init__(self):
-        self._command_line_args_parser = CommandLineArgsParser()
+    def __init__(self, command_line_args_parser: CommandLineArgsParser = None,
+                 ipv4: str = None):
+        self._command_line_args_parser = command_line_args_parser or CommandLineArgsParser()
         self._command_line_args_parser.print_args()
+        self._ipv4 = ipv4
 
         self._model_handler = None
         try:
@@ -33,10 +46,41 @@ class Session:
             print("Fail when loading model file. Shutting down!")
             sys.exit(-1)
 
-        self._predicted_class_stack = PredictedClassStack()
-
-        self._communicator = Communicator()
+        self._predicted_classes = self._model_handler.get_predicted_classes()
+        self._import_from_smoothing_settings()
+
+        self._profiler = LatencyProfiler(
+            is_enabled=self._command_line_args_parser.get_profile(),
+            trace_path=self._command_line_args_parser.get_trace()
+        )
+        self._model_handler.set_profiler(self._profiler)
+
+        # Asynchronous loop creates its own communicator inside event loop, so synchronous one
+        # (with its command scheduler thread) is created only for serial and pipelined drive.
+        self._communicator = None
+        if (self._command_line_args_parser.get_mode() == "run"
+                and self._command_line_args_parser.get_loop() != "async"):
+            self._communicator = Communicator(self._ipv4)
+            self._communicator.set_recording_subdirectory(
+                self._command_line_args_parser.get_record()
+            )
+            self._communicator.set_profiler(self._profiler)
         self._exit_flag = threading.Event()
+        self._frame_statistics = FrameStatistics()
+        self._dropped_frames_amount = 0
+
+
+    def _import_from_smoothing_settings(self):
+        smoothing_settings_reader = SmoothingSettingsReader()
+        smoothing_settings_reader.read()
+        self._temporal_smoother = TemporalSmoother(
+            len(self._predicted_classes),
+            method=smoothing_settings_reader.get_method(),
+            history_size=smoothing_settings_reader.get_history_size(),
+            ema_factor=smoothing_settings_reader.get_ema_factor(),
+            stay_probability=smoothing_settings_reader.get_stay_probability()
+        )
+        self._min_confidence = smoothing_settings_reader.get_min_confidence()
 
 
     def start_session(self):
@@ -49,6 +93,12 @@ class Session:
                 self._model_training()
             case "run":
                 self._start_drive()
+            case "evaluate":
+                self._model_evaluation()
+            case "export":
+                self._model_export()
+            case "sweep":
+                self._model_sweep()
             case _:
                 print("Unknown mode. Shutting down!")
 
@@ -57,71 +107,202 @@ class Session:
         self._model_handler.train_model()
 
 
+    def _model_evaluation(self):
+        directory = self._command_line_args_parser.get_directory()
+        self._model_handler.evaluate_directory(directory)
+
+
+    def _model_export(self):
+        self._model_handler.export_model()
+
+
+    def _model_sweep(self):
+        hyperparameter_sweep = HyperparameterSweep(self._command_line_args_parser)
+        hyperparameter_sweep.run()
+
+
     def _start_drive(self):
-        main_thread = threading.Thread(target=self._main_loop)
+        main_thread = threading.Thread(target=self._select_main_loop())
 
         timer = Timer(self._command_line_args_parser.get_time(), self._exit_flag)
         timer_thread = threading.Thread(target=timer.start_timer)
 
         if self._check_if_play_music():
             self._run_music_player_thread()
+        if self._command_line_args_parser.get_camera() == "stream":
+            self._communicator.start_stream()
         main_thread.start()
         timer_thread.start()
 
         main_thread.join()
+        if self._communicator is not None:
+            self._communicator.close()
+            self._communicator.print_commands_statistics()
+        self._frame_statistics.print_statistics(self._dropped_frames_amount)
+        self._profiler.print_statistics()
+        self._profiler.save_trace()
         print("Program has finished.")
 
 
+    def _select_main_loop(self):
+        match self._command_line_args_parser.get_loop():
+            case "pipelined":
+                return self._pipelined_main_loop
+            case "async":
+                return self._async_main_loop
+            case _:
+                return self._main_loop
+
+
     def _main_loop(self):
         print("Starting main loop of application")
         self._turn_on_car()
         while not self._exit_flag.is_set():
-            self._car_steering()
+            with self._profiler.measure("control tick"):
+                self._car_steering()
 
         self._turn_off_car()
 
 
-    def _car_steering(self):
-        response = self._communicator.take_photo()
-        if response is not None:
-            predicted_class = self._model_handler.classify_image(response)
-            print(f"Predicted class: {predicted_class.name}")
+    def _pipelined_main_loop(self):
+        print("Starting pipelined main loop of application")
+        self._turn_on_car()
+        pipelined_loop = PipelinedLoop(
+            self._communicator,
+            self._model_handler,
+            self._handle_prediction,
+            self._exit_flag,
+            self._frame_statistics
+        )
+        pipelined_loop.run()
+        self._dropped_frames_amount = pipelined_loop.get_dropped_frames_amount()
+
+        self._turn_off_car()
+
+
+    def _async_main_loop(self):
+        print("Starting asynchronous main loop of application")
+        async_communicator = AsyncCommunicator(self._ipv4)
+        async_communicator.set_recording_subdirectory(self._command_line_args_parser.get_record())
+        async_communicator.set_profiler(self._profiler)
+        async_loop = AsyncLoop(
+            async_communicator,
+            self._model_handler,
+            self._select_commands,
+            self._record_decision_latency,
+            self._exit_flag,
+            self._frame_statistics
+        )
+        async_loop.run()
 
-            self._predicted_class_stack.push(predicted_class)
-            self._send_commands_based_on_predicted_class(predicted_class)
+
+    def _car_steering(self):
+        frame = self._communicator.fetch_frame()
+        if frame is not None:
+            probabilities = self._model_handler.predict_frame(frame)
+            frame.release()
+            self._frame_statistics.record(frame)
+            self._handle_prediction(probabilities, frame)
         else:
             print("No response")
 
 
-    def _send_commands_based_on_predicted_class(self, predicted_class: str):
+    def _handle_prediction(self, probabilities: torch.Tensor, frame: Frame):
+        for command in self._select_commands(probabilities):
+            self._communicator.send_request(command)
+        self._record_decision_latency(frame)
+
+
+    def _record_decision_latency(self, frame: Frame):
+        """
+        Record end-to-end latency of decision: time from capturing the frame until steering
+        commands based on it were sent.
+        """
+        latency_s = frame.get_age()
+        self._profiler.record("decision latency", time.perf_counter() - latency_s, latency_s)
+
+
+    def _select_commands(self, probabilities: torch.Tensor) -> list:
+        """
+        Select steering commands based on probabilities of classes predicted for the newest
+        photo, smoothed with predictions for previous photos.
+        """
+        with self._profiler.measure("smoothing"):
+            smoothed_probabilities = self._temporal_smoother.update(probabilities)
+            predicted_class = self._select_predicted_class(smoothed_probabilities)
+        print(f"Predicted class: {predicted_class.name} "
+              f"({float(smoothed_probabilities.max()):.2f})")
+
+        return self._select_commands_based_on_predicted_class(predicted_class)
+
+
+    def _select_predicted_class(self, probabilities: torch.Tensor) -> PredictedClass:
+        """
+        The most probable class, or thrash, if it isn't probable enough.
+        """
+        confidence, index = probabilities.max(dim=0)
+        if confidence.item() < self._min_confidence:
+            return PredictedClass.THRASH_IMAGE
+
+        return self._predicted_classes[index.item()]
+
+
+    def _find_last_steering_class(self) -> PredictedClass:
+        """
+        The newest class other than thrash among last smoothed predictions, or None.
+        """
+        for probabilities in self._temporal_smoother.get_history():
+            predicted_class = self._select_predicted_class(probabilities)
+            if predicted_class != PredictedClass.THRASH_IMAGE:
+                return predicted_class
+
+        return None
+
+
+    def _select_commands_based_on_predicted_class(self, predicted_class: PredictedClass) -> list:
+        commands = []
         match predicted_class:
             case PredictedClass.FORWARD:
-                self._communicator.send_request(SteeringCommand.FORWARD)
+                commands.append(SteeringCommand.FORWARD)
             case PredictedClass.BACK:
-                self._communicator.send_request(SteeringCommand.BACK)
+                commands.append(SteeringCommand.BACK)
             case PredictedClass.RIGHT:
-                self._communicator.send_request(SteeringCommand.RIGHT)
+                commands.append(SteeringCommand.RIGHT)
             case PredictedClass.LEFT:
-                self._communicator.send_request(SteeringCommand.LEFT)
+                commands.append(SteeringCommand.LEFT)
             case PredictedClass.SLIGHT_RIGHT:
-                self._communicator.send_request(SteeringCommand.SLIGHT_RIGHT)
+                commands.append(SteeringCommand.SLIGHT_RIGHT)
             case PredictedClass.SLIGHT_LEFT:
-                self._communicator.send_request(SteeringCommand.SLIGHT_LEFT)
+                commands.append(SteeringCommand.SLIGHT_LEFT)
             case PredictedClass.THRASH_IMAGE:
-                if self._predicted_class_stack.check_if_stack_contains_only_thrash():
-                    self._communicator.send_request(SteeringCommand.STOP)
+                previous_class = self._find_last_steering_class()
+                if previous_class is None:
+                    commands.append(SteeringCommand.STOP)
                 else:
-                    previous_command = self._predicted_class_stack.get_last_non_thrash_class()
-                    if previous_command != PredictedClass.FORWARD:
-                        self._communicator.send_request(SteeringCommand.FORWARD)
-                    if previous_command is not None:
-                        self._communicator.send_request(previous_command)
-                    else:
-                        self._communicator.send_request(SteeringCommand.STOP)
+                    if previous_class != PredictedClass.FORWARD:
+                        commands.append(SteeringCommand.FORWARD)
+                    commands.extend(self._select_commands_based_on_predicted_class(previous_class))
 
             case _:
                 print("Unknown class predicted. Turning off robotic car.")
-                self._turn_off_car()
+                commands.append(SteeringCommand.STOP)
+
+        return commands
+
+
+    def get_frame_statistics(self) -> FrameStatistics:
+        """Statistics of frames classified during drive getter."""
+        return self._frame_statistics
+
+
+    def get_profiler(self) -> LatencyProfiler:
+        """Latency profiler getter."""
+        return self._profiler
+
+
+    def get_communicator(self) -> Communicator:
+        """Communicator getter. None in other modes than 'run' and in asynchronous loop."""
+        return self._communicator
 
 
     def _turn_on_car(self):
@@ -17,6 +17,10 @@ class RequestsSettingsReader(SettingsReader):
         SettingsReader.__init__(self)
         self._path = "../../settings/requests.yaml"
         self._request_timeout = None
+        self._pool_size = None
+        self._retries = None
+        self._backoff_factor = None
+        self._stream_path = None
 
 
     def read(self):
@@ -24,6 +28,10 @@ class RequestsSettingsReader(SettingsReader):
         try:
             settings = yaml.safe_load(open(file=self._path, mode="r", encoding="utf-8"))
             self._request_timeout = settings['requests-settings']['timeout']
+            self._pool_size = settings['requests-settings']['pool-size']
+            self._retries = settings['requests-settings']['retries']
+            self._backoff_factor = settings['requests-settings']['backoff-factor']
+            self._stream_path = settings['requests-settings']['stream-path']
         except FileNotFoundError:
             print(f"Critical error! Can't find {self._path} file with settings!")
 
@@ -33,7 +41,31 @@ class RequestsSettingsReader(SettingsReader):
         return self._request_timeout
 
 
+    def get_pool_size(self) -> int:
+        """pool_size getter."""
+        return self._pool_size
+
+
+    def get_retries(self) -> int:
+        """retries getter."""
+        return self._retries
+
+
+    def get_backoff_factor(self) -> float:
+        """backoff_factor getter."""
+        return self._backoff_factor
+
+
+    def get_stream_path(self) -> str:
+        """stream_path getter."""
+        return self._stream_path
+
+
 if __name__ == "__main__":
     reader = RequestsSettingsReader()
     reader.read()
     print(f"Request timeout [s]: {reader.get_request_timeout()}")
+    print(f"Pool size: {reader.get_pool_size()}")
+    print(f"Retries: {reader.get_retries()}")
+    print(f"Backoff factor [s]: {reader.get_backoff_factor()}")
+    print(f"Stream path: {reader.get_stream_path()}")
@@ -0,0 +1,72 @@
+"""
+SmoothingSettingsReader class is responsible for reading settings of temporal smoothing
+of predictions from .yaml file.
+"""
+
+import yaml
+
+from settings_readers.settings_reader import SettingsReader
+
+
+class SmoothingSettingsReader(SettingsReader):
+    """
+    Class is responsible for reading settings of temporal smoothing of predictions from .yaml
+    file: smoothing method, its parameters and minimal confidence of smoothed prediction.
+    """
+
+    def __init__(self):
+        SettingsReader.__init__(self)
+        self._path = "../../settings/smoothing.yaml"
+        self._method = "hmm"
+        self._history_size = 8
+        self._ema_factor = 0.5
+        self._stay_probability = 0.9
+        self._min_confidence = 0.4
+
+
+    def read(self):
+        """Method responsible for reading from .yaml file."""
+        try:
+            settings = yaml.safe_load(open(file=self._path, mode="r", encoding="utf-8"))
+            self._method = settings['smoothing-settings']['method']
+            self._history_size = settings['smoothing-settings']['history-size']
+            self._ema_factor = settings['smoothing-settings']['ema-factor']
+            self._stay_probability = settings['smoothing-settings']['stay-probability']
+            self._min_confidence = settings['smoothing-settings']['min-confidence']
+        except FileNotFoundError:
+            print(f"Critical error! Can't find {self._path} file with settings!")
+
+
+    def get_method(self) -> str:
+        """method getter."""
+        return self._method
+
+
+    def get_history_size(self) -> int:
+        """history_size getter."""
+        return self._history_size
+
+
+    def get_ema_factor(self) -> float:
+        """ema_factor getter."""
+        return self._ema_factor
+
+
+    def get_stay_probability(self) -> float:
+        """stay_probability getter."""
+        return self._stay_probability
+
+
+    def get_min_confidence(self) -> float:
+        """min_confidence getter."""
+        return self._min_confidence
+
+
+if __name__ == "__main__":
+    reader = SmoothingSettingsReader()
+    reader.read()
+    print(f"Method: {reader.get_method()}")
+    print(f"History size: {reader.get_history_size()}")
+    print(f"EMA factor: {reader.get_ema_factor()}")
+    print(f"Stay probability: {reader.get_stay_probability()}")
+    print(f"Min confidence: {reader.get_min_confidence()}")
@@ -0,0 +1,88 @@
+"""
+SweepSettingsReader class is responsible for reading hyperparameter sweep settings from .yaml
+file.
+"""
+
+import yaml
+
+from settings_readers.settings_reader import SettingsReader
+
+
+class SweepSettingsReader(SettingsReader):
+    """
+    Class is responsible for reading hyperparameter sweep settings from .yaml file: type
+    of search, swept parameters and resources of parallel trials.
+    """
+
+    def __init__(self):
+        SettingsReader.__init__(self)
+        self._path = "../../settings/sweep.yaml"
+        self._search = "grid"
+        self._trials = 8
+        self._seed = 0
+        self._parallel_trials = 2
+        self._threads_per_trial = 0
+        self._workers_per_trial = 1
+        self._parameters = {}
+
+
+    def read(self):
+        """Method responsible for reading from .yaml file."""
+        try:
+            settings = yaml.safe_load(open(file=self._path, mode="r", encoding="utf-8"))
+            self._search = settings['sweep-settings']['search']
+            self._trials = settings['sweep-settings']['trials']
+            self._seed = settings['sweep-settings']['seed']
+            self._parallel_trials = settings['sweep-settings']['parallel-trials']
+            self._threads_per_trial = settings['sweep-settings']['threads-per-trial']
+            self._workers_per_trial = settings['sweep-settings']['workers-per-trial']
+            self._parameters = settings['sweep-settings']['parameters'] or {}
+        except FileNotFoundError:
+            print(f"Critical error! Can't find {self._path} file with settings!")
+
+
+    def get_search(self) -> str:
+        """search getter."""
+        return self._search
+
+
+    def get_trials(self) -> int:
+        """trials getter."""
+        return self._trials
+
+
+    def get_seed(self) -> int:
+        """seed getter."""
+        return self._seed
+
+
+    def get_parallel_trials(self) -> int:
+        """parallel_trials getter."""
+        return self._parallel_trials
+
+
+    def get_threads_per_trial(self) -> int:
+        """threads_per_trial getter."""
+        return self._threads_per_trial
+
+
+    def get_workers_per_trial(self) -> int:
+        """workers_per_trial getter."""
+        return self._workers_per_trial
+
+
+    def get_parameters(self) -> dict:
+        """parameters getter."""
+        return self._parameters
+
+
+if __name__ == "__main__":
+    reader = SweepSettingsReader()
+    reader.read()
+    print(f"Search: {reader.get_search()}")
+    print(f"Trials: {reader.get_trials()}")
+    print(f"Seed: {reader.get_seed()}")
+    print(f"Parallel trials: {reader.get_parallel_trials()}")
+    print(f"Threads per trial: {reader.get_threads_per_trial()}")
+    print(f"Workers per trial: {reader.get_workers_per_trial()}")
+    print(f"Parameters: {reader.get_parameters()}")
@@ -0,0 +1,79 @@
+"""
+TrainingSettingsReader class is responsible for reading training settings from .yaml file.
+"""
+
+import yaml
+
+from settings_readers.settings_reader import SettingsReader
+
+
+class TrainingSettingsReader(SettingsReader):
+    """
+    Class is responsible for reading training settings from .yaml file: precision of training,
+    augmentation and parameters of data loaders.
+    """
+
+    def __init__(self):
+        SettingsReader.__init__(self)
+        self._path = "../../settings/training.yaml"
+        self._throughput_mode = False
+        self._workers = 8
+        self._persistent_workers = True
+        self._prefetch_factor = 2
+        self._pin_memory = True
+        self._augmentation = True
+
+
+    def read(self):
+        """Method responsible for reading from .yaml file."""
+        try:
+            settings = yaml.safe_load(open(file=self._path, mode="r", encoding="utf-8"))
+            self._throughput_mode = settings['training-settings']['throughput-mode']
+            self._workers = settings['training-settings']['workers']
+            self._persistent_workers = settings['training-settings']['persistent-workers']
+            self._prefetch_factor = settings['training-settings']['prefetch-factor']
+            self._pin_memory = settings['training-settings']['pin-memory']
+            self._augmentation = settings['training-settings']['augmentation']
+        except FileNotFoundError:
+            print(f"Critical error! Can't find {self._path} file with settings!")
+
+
+    def get_throughput_mode(self) -> bool:
+        """throughput_mode getter."""
+        return self._throughput_mode
+
+
+    def get_workers(self) -> int:
+        """workers getter."""
+        return self._workers
+
+
+    def get_persistent_workers(self) -> bool:
+        """persistent_workers getter."""
+        return self._persistent_workers
+
+
+    def get_prefetch_factor(self) -> int:
+        """prefetch_factor getter."""
+        return self._prefetch_factor
+
+
+    def get_pin_memory(self) -> bool:
+        """pin_memory getter."""
+        return self._pin_memory
+
+
+    def get_augmentation(self) -> bool:
+        """augmentation getter."""
+        return self._augmentation
+
+
+if __name__ == "__main__":
+    reader = TrainingSettingsReader()
+    reader.read()
+    print(f"Throughput mode: {reader.get_throughput_mode()}")
+    print(f"Workers: {reader.get_workers()}")
+    print(f"Persistent workers: {reader.get_persistent_workers()}")
+    print(f"Prefetch factor: {reader.get_prefetch_factor()}")
+    print(f"Pin memory: {reader.get_pin_memory()}")
+    print(f"Augmentation: {reader.get_augmentation()}")
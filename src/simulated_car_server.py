@@ -0,0 +1,198 @@
+"""
+SimulatedCarServer class is local stand-in for HTTP API of robotic car. It serves recorded
+.jpg photos, so communication with the car can be run and tested without the physical car.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class SimulatedCarServer:
+    """
+    Class is HTTP server imitating robotic car. It serves photos from given directory in a loop
+    on /photo endpoint and as continuous multipart MJPEG stream on /stream endpoint, and accepts
+    steering commands on /drive endpoint. Every /photo and /drive response is delayed by
+    latency_s with uniformly distributed jitter of +/- jitter_s to imitate Wi-Fi round trip.
+    """
+
+    def __init__(self, photos_directory: str, port: int = 0, stream_fps: float = 20.0,
+                 latency_s: float = 0.0, jitter_s: float = 0.0):
+        self._photos = self._load_photos(photos_directory)
+        if not self._photos:
+            raise FileNotFoundError(f"No .jpg photos in {photos_directory}")
+        self._next_photo_index = 0
+        self._stream_boundary = "frame"
+        self._stream_interval_s = 1.0 / stream_fps
+        self._latency_s = latency_s
+        self._jitter_s = jitter_s
+        self._photos_served_amount = 0
+        self._speed_commands_amount = 0
+        self._turn_commands_amount = 0
+        self._lock = threading.Lock()
+        self._is_running = False
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._create_request_handler())
+        self._server.daemon_threads = True
+        self._server_thread = None
+
+
+    def _load_photos(self, photos_directory: str) -> list:
+        photos = []
+        for root, _, filenames in os.walk(photos_directory):
+            for filename in sorted(filenames):
+                if filename.lower().endswith((".jpg", ".jpeg")):
+                    with open(file=os.path.join(root, filename), mode="rb") as file:
+                        photos.append(file.read())
+
+        return photos
+
+
+    def start(self):
+        """Start serving requests in a background thread."""
+        self._is_running = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever,
+                                               name="simulated-car-server", daemon=True)
+        self._server_thread.start()
+
+
+    def stop(self):
+        """Stop serving requests."""
+        self._is_running = False
+        self._server.shutdown()
+        self._server.server_close()
+        if self._server_thread is not None:
+            self._server_thread.join()
+
+
+    def get_address(self) -> str:
+        """Address of the server in host:port form, which can be used as robotic car ipv4."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+
+    def next_photo(self) -> bytes:
+        """Next recorded photo getter. Photos are served in a loop."""
+        with self._lock:
+            photo = self._photos[self._next_photo_index]
+            self._next_photo_index = (self._next_photo_index + 1) % len(self._photos)
+            self._photos_served_amount += 1
+
+        return photo
+
+
+    def handle_drive(self, query: str):
+        """Handle steering command sent to /drive endpoint: count speed and turn commands."""
+        with self._lock:
+            if query.startswith("speed="):
+                self._speed_commands_amount += 1
+            elif query.startswith("turn="):
+                self._turn_commands_amount += 1
+
+
+    def simulate_latency(self):
+        """Delay response by configured latency and jitter."""
+        delay_s = self._latency_s + random.uniform(-self._jitter_s, self._jitter_s)
+        if delay_s > 0:
+            time.sleep(delay_s)
+
+
+    def get_photos_served_amount(self) -> int:
+        """Amount of served photos getter."""
+        return self._photos_served_amount
+
+
+    def get_speed_commands_amount(self) -> int:
+        """Amount of received speed commands getter."""
+        return self._speed_commands_amount
+
+
+    def get_turn_commands_amount(self) -> int:
+        """Amount of received turn commands getter."""
+        return self._turn_commands_amount
+
+
+    def _create_request_handler(self):
+        simulated_car = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            """Handler of HTTP requests sent to simulated car."""
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                """Handle GET request."""
+                path, _, query = self.path.partition("?")
+                match path:
+                    case "/photo":
+                        simulated_car.simulate_latency()
+                        self._send_photo()
+                    case "/stream":
+                        self._send_stream()
+                    case "/drive":
+                        simulated_car.simulate_latency()
+                        simulated_car.handle_drive(query)
+                        self._send_body(b"OK", "text/plain")
+                    case _:
+                        self.send_error(404)
+
+            def _send_photo(self):
+                self._send_body(simulated_car.next_photo(), "image/jpeg")
+
+            def _send_body(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self):
+                boundary = simulated_car._stream_boundary
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={boundary}")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                try:
+                    while simulated_car._is_running:
+                        photo = simulated_car.next_photo()
+                        self.wfile.write(f"--{boundary}\r\n".encode("ascii"))
+                        self.wfile.write(b"Content-Type: image/jpeg\r\n")
+                        self.wfile.write(f"Content-Length: {len(photo)}\r\n\r\n".encode("ascii"))
+                        self.wfile.write(photo)
+                        self.wfile.write(b"\r\n")
+                        self.wfile.flush()
+                        time.sleep(simulated_car._stream_interval_s)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+
+            def log_message(self, format, *args):
+                """Requests are not logged on console."""
+
+        return RequestHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for robotic car HTTP API")
+    parser.add_argument("--photos", type=str, required=True,
+                        help="Directory with recorded .jpg photos to serve")
+    parser.add_argument("--port", type=int, default=8080, help="Port of the server")
+    parser.add_argument("--fps", type=float, default=20.0, help="Frame rate of MJPEG stream")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Delay of /photo and /drive responses in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Maximal random deviation of the delay in seconds")
+    args = parser.parse_args()
+
+    server = SimulatedCarServer(args.photos, args.port, args.fps, args.latency, args.jitter)
+    server.start()
+    print(f"Simulated car is listening on {server.get_address()}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        sys.exit()
@@ -0,0 +1,95 @@
+"""
+TemporalSmoother class is responsible for smoothing probabilities of classes predicted for
+consecutive photos from robotic car, so single misclassified photo doesn't change steering.
+"""
+
+import torch
+
+
+class TemporalSmoother:
+    """
+    Class filters softmax probabilities of consecutive predictions with one of methods:
+        hmm - forward filter of hidden Markov model: belief of previous photo is propagated
+              by class transition prior (class stays the same with stay probability, or
+              changes into any other class) and multiplied by probabilities of current photo,
+        ema - exponential moving average of probabilities,
+        none - probabilities aren't smoothed.
+    Probabilities of the model are used as emission likelihoods of hmm, which assumes equal
+    prior probabilities of classes.
+    Last smoothed predictions are kept in fixed-size ring buffer.
+    """
+
+    METHODS = ("hmm", "ema", "none")
+
+    def __init__(self, classes_amount: int, method: str = "hmm", history_size: int = 8,
+                 ema_factor: float = 0.5, stay_probability: float = 0.9):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown smoothing method: {method}. It has to be one of: "
+                             f"{', '.join(self.METHODS)}")
+        self._classes_amount = classes_amount
+        self._method = method
+        self._ema_factor = ema_factor
+        self._transition_matrix = self._create_transition_matrix(stay_probability)
+        self._belief = None
+
+        self._history = torch.zeros(history_size, classes_amount)
+        self._next_history_index = 0
+        self._history_amount = 0
+
+
+    def _create_transition_matrix(self, stay_probability: float) -> torch.Tensor:
+        """
+        Matrix of probabilities of transition from class (row) to class (column).
+        """
+        if self._classes_amount == 1:
+            return torch.ones(1, 1)
+
+        change_probability = (1 - stay_probability) / (self._classes_amount - 1)
+        transition_matrix = torch.full((self._classes_amount, self._classes_amount),
+                                       change_probability)
+        transition_matrix.fill_diagonal_(stay_probability)
+
+        return transition_matrix
+
+
+    def update(self, probabilities: torch.Tensor) -> torch.Tensor:
+        """
+        Smooth probabilities of classes predicted for the newest photo and return smoothed
+        probabilities.
+        """
+        probabilities = probabilities.float()
+        if self._belief is None or self._method == "none":
+            self._belief = probabilities.clone()
+        elif self._method == "ema":
+            self._belief = ((1 - self._ema_factor) * self._belief
+                            + self._ema_factor * probabilities)
+        else:
+            predicted_belief = self._belief @ self._transition_matrix
+            self._belief = predicted_belief * probabilities.clamp(min=1e-6)
+            self._belief /= self._belief.sum()
+
+        self._history[self._next_history_index].copy_(self._belief)
+        self._next_history_index = (self._next_history_index + 1) % len(self._history)
+        self._history_amount = min(self._history_amount + 1, len(self._history))
+
+        return self._belief
+
+
+    def get_history(self) -> torch.Tensor:
+        """
+        Last smoothed probabilities getter, the newest first. Shape of the tensor is
+        (amount of kept predictions, amount of classes).
+        """
+        indices = (self._next_history_index - 1 - torch.arange(self._history_amount)) \
+            % len(self._history)
+
+        return self._history[indices]
+
+
+if __name__ == "__main__":
+    smoother = TemporalSmoother(3)
+    for frame_probabilities in ([0.6, 0.3, 0.1], [0.2, 0.7, 0.1], [0.7, 0.2, 0.1],
+                                [0.5, 0.4, 0.1], [0.1, 0.8, 0.1], [0.2, 0.7, 0.1]):
+        smoothed = smoother.update(torch.tensor(frame_probabilities))
+        print(f"Probabilities: {frame_probabilities}   smoothed: {smoothed.tolist()}")
+    print(f"History: {smoother.get_history().tolist()}")